@@ -0,0 +1,244 @@
+"""Benchmarks for rolling and exact evaluation of representative dice from every module.
+
+Run `python benchmark.py` to print the timings and write them to a JSON
+baseline (in the temporary directory unless `--output` says where); run it
+again with `--compare <baseline>` to see how much each number changed since."""
+
+import argparse
+import copy
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+
+from dices.cache import distribution_cache
+from dices.catalog import load_catalog
+from dices.composed_dice import ComposedDice, DuoDice, MultiDice, OneExtraSideDice
+from dices.dice import BaseDice, Dice, SequentialDice
+from dices.gaming_dices import AdvantageDices, ComboDice, DisadvantageDices
+from dices.math_dices import (
+    ConcatenationDice,
+    ExponentiationDice,
+    GCDDice,
+    HipotenuseDice,
+    MultiplicationDice,
+    SumDice,
+)
+from dices.math_operations_dices import (
+    ClampDice,
+    FactorialDice,
+    LogDice,
+    ModDice,
+    OffsetDice,
+    PrimeDice,
+)
+from dices.misc_dices import (
+    AlwaysMaxDice,
+    CarouselDice,
+    CountDicesDice,
+    IgnoreDice,
+    SelfComplexityDice,
+    TheFutureDice,
+)
+from dices.programming_dices import (
+    AndDice,
+    ForLoopDice,
+    GreaterThanDice,
+    RoutingDice,
+    WhileLoopDice,
+)
+from dices.states_dices import (
+    AccumulatorSumDice,
+    LimitUsesDice,
+    MaxStateDice,
+    RemoveItemDice,
+    ThePastDice,
+)
+from dices.statistical_dices import (
+    MeanDice,
+    MedianDice,
+    RangeDice,
+    StdDevDice,
+    WeightedMeanDice,
+)
+
+ROLLS = 20_000  # single rolls timed per dice, also the size of simulate_rolls
+# timings only hold for the machine that took them, so they stay out of the repo
+DEFAULT_OUTPUT = os.path.join(tempfile.gettempdir(), "dice_benchmark.json")
+
+
+def build_cases() -> dict[str, list[BaseDice]]:
+    d4 = SequentialDice(4)
+    d6 = SequentialDice(6)
+    d8 = SequentialDice(8)
+    d10 = SequentialDice(10)
+    d12 = SequentialDice(12)
+    d20 = SequentialDice(20)
+    catalog = load_catalog()
+    return {
+        "math_dices": [
+            SumDice([d20] * 8),
+            MultiplicationDice([d6] * 4),
+            ExponentiationDice(d6, d4),
+            GCDDice([d12, d20, d20]),
+            HipotenuseDice(d20, d20),
+            ConcatenationDice([d6, d8, d10]),
+        ],
+        "math_operations_dices": [
+            ModDice(d20, 7),
+            OffsetDice(d20, 3),
+            ClampDice(d20, 5, 15),
+            LogDice(d20, 2),
+            FactorialDice(d10),
+            PrimeDice(d20),
+        ],
+        "gaming_dices": [
+            AdvantageDices([d20] * 4),
+            DisadvantageDices([d20] * 4),
+            AdvantageDices([DisadvantageDices([d6, d6])] * 3),
+            ComboDice(d6, [6], combo_limit=5),
+        ],
+        "statistical_dices": [
+            MeanDice([d6, d8, d10, d12]),
+            MedianDice([d6, d8, d10, d12]),
+            StdDevDice([d6, d8, d10]),
+            RangeDice([d20] * 4),
+            WeightedMeanDice([d6, d8], [d4, d4]),
+        ],
+        "programming_dices": [
+            RoutingDice(d4, [d6, d8, d10, d12]),
+            ForLoopDice(d6, d4),
+            WhileLoopDice(d6, d6, 6, loop_limit=4),
+            AndDice([d4, Dice([0, 1])]),
+            GreaterThanDice(d20, d20),
+        ],
+        "composed_dice": [
+            MultiDice([d6, d8, d10]),
+            DuoDice(d20, d20),
+            ComposedDice(SequentialDice(2), [d6, d8]),
+            OneExtraSideDice(d12),
+        ],
+        "states_dices": [
+            RemoveItemDice([1, 2, 3, 4, 5, 6]),
+            AccumulatorSumDice(d6),
+            MaxStateDice(SumDice([d6, d6])),
+            ThePastDice(d20, 3),
+            LimitUsesDice(d20, 10),
+        ],
+        "misc_dices": [
+            TheFutureDice(d20),
+            CarouselDice([d6, d8, d10]),
+            IgnoreDice(d20),
+            AlwaysMaxDice(d12),
+            SelfComplexityDice(SumDice([d6, d6])),
+            CountDicesDice(d8),
+        ],
+        "from_1_to_100": [
+            catalog[7],
+            catalog[49],
+            catalog[73],
+            catalog[94],
+            catalog[100],
+        ],
+    }
+
+
+def best_time(
+    dice: BaseDice, function: Callable[[BaseDice], object], repeat: int = 3
+) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        # a fresh copy every time, so dice with state start every measure the same
+        fresh = copy.deepcopy(dice)
+        start = time.perf_counter()
+        function(fresh)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def peak_memory(dice: BaseDice, function: Callable[[BaseDice], object]) -> int:
+    fresh = copy.deepcopy(dice)
+    tracemalloc.start()
+    try:
+        function(fresh)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def roll_many(dice: BaseDice) -> None:
+    for _ in range(ROLLS):
+        dice.roll()
+
+
+def exact_probabilities(dice: BaseDice) -> dict[int, float]:
+    distribution_cache.clear()  # time the evaluation itself, not a cache hit
+    return dice.get_probabilities()
+
+
+def measure(dice: BaseDice) -> dict[str, float]:
+    results: dict[str, float] = {}
+    results["roll_per_second"] = ROLLS / best_time(dice, roll_many, 1)
+    results["simulate_rolls_seconds"] = best_time(
+        dice, lambda fresh: fresh.simulate_rolls(ROLLS), 1
+    )
+    results["get_probabilities_seconds"] = best_time(dice, exact_probabilities)
+    results["get_probabilities_peak_bytes"] = peak_memory(dice, exact_probabilities)
+    return results
+
+
+def run() -> dict[str, dict[str, dict[str, float]]]:
+    report: dict[str, dict[str, dict[str, float]]] = {}
+    for module, dices in build_cases().items():
+        report[module] = {}
+        for position, dice in enumerate(dices):
+            # str() of some dice holds memory addresses, so key on the class instead
+            name = f"{position:02d} {type(dice).__name__}"
+            results = measure(dice)
+            report[module][name] = results
+            print(
+                f"{module:22} {name:28} "
+                f"{results['roll_per_second']:>12,.0f} rolls/s "
+                f"{results['get_probabilities_seconds'] * 1000:>10.3f} ms exact "
+                f"{results['get_probabilities_peak_bytes'] / 1024:>10.1f} KiB"
+            )
+    return report
+
+
+def compare(
+    baseline: dict[str, dict[str, dict[str, float]]],
+    report: dict[str, dict[str, dict[str, float]]],
+) -> None:
+    print("\nChanges against the baseline (new / old):")
+    for module, dices in report.items():
+        for name, results in dices.items():
+            old_results = baseline.get(module, {}).get(name)
+            if old_results is None:
+                print(f"{module:22} {name:28} new")
+                continue
+            ratios = ", ".join(
+                f"{metric} x{value / old_results[metric]:.2f}"
+                for metric, value in results.items()
+                if old_results.get(metric)
+            )
+            print(f"{module:22} {name:28} {ratios}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    parser.add_argument("--compare", help="baseline JSON written by an earlier run")
+    args = parser.parse_args()
+    report = run()
+    if args.compare:
+        with open(args.compare) as file:
+            compare(json.load(file), report)
+    with open(args.output, "w") as file:
+        json.dump(report, file, indent=2, sort_keys=True)
+    print(f"\nWrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
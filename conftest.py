@@ -0,0 +1,37 @@
+import numpy as np
+
+from dices.dice import BaseDice, Dice
+
+"""Helpers shared by the test files, which import them from here."""
+
+
+def enumerated(dice: BaseDice) -> dict[int, int]:
+    """Counts of the results, going through every outcome one by one."""
+    counts: dict[int, int] = {}
+    for _, result in dice.get_outcomes():
+        counts[result] = counts.get(result, 0) + 1
+    return counts
+
+
+class CountedDice(Dice):
+    """A Dice that counts how many times it was rolled."""
+
+    def __init__(self, sides: list[int]) -> None:
+        super().__init__(sides)
+        self.rolls = 0
+
+    def roll(self) -> int:
+        self.rolls += 1
+        return super().roll()
+
+
+class BatchCountedDice(Dice):
+    """A Dice that counts how many times roll_batch was called on it."""
+
+    def __init__(self, sides: list[int]) -> None:
+        super().__init__(sides)
+        self.batches = 0
+
+    def roll_batch(self, num_rolls: int) -> np.ndarray:
+        self.batches += 1
+        return super().roll_batch(num_rolls)
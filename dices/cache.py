@@ -0,0 +1,57 @@
+from collections import OrderedDict
+from collections.abc import Hashable
+
+from dices.distribution import Distribution
+
+"""This module contains the process-wide cache of exact dice distributions."""
+
+
+class DistributionCache:
+    """Least recently used cache of distributions, keyed on the structure of the dice.
+
+    Only dice without state are stored, since their distribution can't change
+    between calls. A maxsize of 0 disables the cache."""
+
+    def __init__(self, maxsize: int = 256) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, Distribution] = OrderedDict()
+
+    def get(self, key: Hashable) -> Distribution | None:
+        counts = self._entries.get(key)
+        if counts is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return counts
+
+    def put(self, key: Hashable, counts: Distribution) -> None:
+        if self.maxsize <= 0:
+            return
+        self._entries[key] = counts
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def resize(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        while len(self._entries) > max(maxsize, 0):
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def info(self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+        }
+
+
+distribution_cache = DistributionCache()
@@ -0,0 +1,21 @@
+import os
+import sys
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from dices.dice import BaseDice
+
+"""This module finds the from_1_to_100 catalog, for the tools that work on all of it."""
+
+CATALOG_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "from_1_to_100"
+)
+
+
+def load_catalog() -> list["BaseDice"]:
+    """all_dices from the catalog, where all_dices[n] is the dice with n sides."""
+    if CATALOG_DIR not in sys.path:
+        sys.path.insert(0, CATALOG_DIR)
+    from dices_from_1_to_100 import all_dices  # type: ignore
+
+    return all_dices
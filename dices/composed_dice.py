@@ -1,7 +1,57 @@
+from collections.abc import Hashable
+from math import gcd, prod
+from typing import cast
+
+import numpy as np
+
 from dices.dice import BaseDice, BiDice, DiceOfDices, SequentialDice
+from dices.distribution import Distribution
 from dices.math_operations_dices import ModDice
 
 
+def _uniform_count(counts: dict[int, int], max_side: float) -> int | None:
+    # the count every side of 1..max_side has, if they all have the same one
+    sides = int(max_side)
+    if sides != max_side or sides < 1 or len(counts) != sides:
+        return None
+    count = counts.get(1)
+    if count is None or any(counts.get(side) != count for side in range(2, sides + 1)):
+        return None
+    return count
+
+
+def _is_uniform(dice: BaseDice) -> bool:
+    # known uniform over 1..max_side from the structure, without the distribution
+    # of anything bigger than a leaf
+    if dice.has_state():
+        return False
+    if isinstance(dice, (MultiDice, DuoDice)):
+        return all(_is_uniform(child) for child in dice.get_children())
+    if dice.get_children():
+        return False
+    return _uniform_count(dice.get_distribution(), dice.max_side) is not None
+
+
+def _radix_distribution(dice: BaseDice) -> Distribution | None:
+    # uniform children give every index of the mixed radix the same count
+    if dice.has_state():
+        return None
+    per_side = 1
+    for child in dice.get_children():
+        count = _uniform_count(child.get_distribution(), child.max_side)
+        if count is None:
+            return None
+        per_side *= count
+    return Distribution({side: per_side for side in range(1, int(dice.max_side) + 1)})
+
+
+def _uniform_batch(dice: BaseDice, num_rolls: int) -> np.ndarray | None:
+    sides = int(dice.max_side)
+    if sides >= 2**63 or not _is_uniform(dice):
+        return None
+    return dice.batch_generator().integers(1, sides + 1, num_rolls)
+
+
 class MultiDice(DiceOfDices):
     def __init__(self, dices: list[BaseDice]) -> None:
         if not dices:
@@ -19,6 +69,40 @@ class MultiDice(DiceOfDices):
             multiplier *= int(self.dices[index].max_side)
         return result + 1
 
+    def apply_logic_batch(self, rolls: np.ndarray) -> np.ndarray:
+        result = np.zeros(rolls.shape[1], dtype=rolls.dtype)
+        multiplier = 1
+        for index, row in enumerate(rolls):
+            result = result + (row - 1) * multiplier
+            multiplier *= int(self.dices[index].max_side)
+        return result + 1
+
+    def fold_start(self) -> Hashable:
+        return 0
+
+    def fold_roll(self, state: Hashable, index: int, roll: int) -> Hashable:
+        multiplier = 1
+        for dice in self.dices[:index]:
+            multiplier *= int(dice.max_side)
+        return cast(int, state) + (roll - 1) * multiplier
+
+    def fold_result(self, state: Hashable) -> int:
+        return cast(int, state) + 1
+
+    def roll_batch(self, num_rolls: int) -> np.ndarray:
+        # when every dice is uniform, draw straight from 1..max_side
+        if not self.faithful_rolls:
+            rolls = _uniform_batch(self, num_rolls)
+            if rolls is not None:
+                return rolls
+        return super().roll_batch(num_rolls)
+
+    def compute_distribution(self) -> Distribution:
+        counts = _radix_distribution(self)
+        if counts is None:
+            return super().compute_distribution()
+        return counts
+
     def __str__(self) -> str:
         dices_explain = ", ".join(str(dice) for dice in self.dices)
         return f"MultiDice({dices_explain})"
@@ -33,11 +117,46 @@ class DuoDice(BiDice):  # it's a multi dice with two dices. here for legacy reas
         b_sides = int(self.dice_b.max_side)
         return (roll_a - 1) * b_sides + roll_b
 
+    def apply_logic_batch(self, rolls_a: np.ndarray, rolls_b: np.ndarray) -> np.ndarray:
+        b_sides = int(self.dice_b.max_side)
+        return (rolls_a - 1) * b_sides + rolls_b
+
+    def roll_batch(self, num_rolls: int) -> np.ndarray:
+        # the same shortcut as MultiDice.roll_batch
+        if not self.faithful_rolls:
+            rolls = _uniform_batch(self, num_rolls)
+            if rolls is not None:
+                return rolls
+        return super().roll_batch(num_rolls)
+
+    def compute_distribution(self) -> Distribution:
+        counts = _radix_distribution(self)
+        if counts is None:
+            return super().compute_distribution()
+        return counts
+
     def __str__(self) -> str:
         return f"DuoDice({self.dice_a}, {self.dice_b})"
 
 
+def _place_counts(before: int, stride: int, after: int, sides: int) -> list[int]:
+    # how many a < before and b < after give each value of (a * stride + b) % sides
+    period = sides // gcd(stride, sides)
+    strides = [0] * sides
+    for a in range(min(before, period)):
+        strides[a * stride % sides] += before // period + (a < before % period)
+    places = [0] * sides
+    for value, count in enumerate(strides):
+        if count:
+            for b in range(min(after, sides)):
+                amount = after // sides + (b < after % sides)
+                places[(value + b) % sides] += count * amount
+    return places
+
+
 class ComposedDice(DiceOfDices):
+    stateful = True
+
     def __init__(self, decision_dice: BaseDice, dices: list[BaseDice]) -> None:
         if not dices:
             raise ValueError("At least one dice must be provided")
@@ -61,7 +180,9 @@ class ComposedDice(DiceOfDices):
 
     def apply_logic(self, rolls: list[int]) -> int:
         decision = rolls[0]
-        dice_result = rolls[decision]
+        return self._compose(decision, rolls[decision])
+
+    def _compose(self, decision: int, dice_result: int) -> int:
         total = sum(int(dice.max_side) for dice in self.dices[1 : decision + 1])
         result = (dice_result + total - self._rounds) % int(self.max_side)
         self.rounds += 1
@@ -69,12 +190,66 @@ class ComposedDice(DiceOfDices):
             return int(self.max_side)
         return result
 
+    def roll(self) -> int:
+        # the rounds move once per roll whatever is picked, so only the picked
+        # dice has to be rolled, unless the dices have state of their own
+        if self.dices_have_state():
+            return super().roll()
+        decision = self.dices[0].roll()
+        selected = self.dices[decision]
+        if decision % len(self.dices) == 0:
+            return self._compose(decision, decision)
+        return self._compose(decision, selected.roll())
+
+    def compute_distribution(self) -> Distribution:
+        """The counts enumerating every combination gives, without enumerating them.
+
+        Every combination moves the rounds on, so its result depends on its
+        place in the enumeration. Within the block of one decision, the place
+        is a * picked * after + s * after + b, with s the outcome of the picked
+        dice and a, b those of the dices before and after it, so it is enough
+        to know how many (a, b) give each place modulo max_side."""
+        sides = int(self.max_side)
+        if sides <= 0 or any(dice.has_state() for dice in self.dices):
+            return super().compute_distribution()
+        outcomes = [[result for _, result in dice.iter_outcomes()] for dice in self.dices]
+        if any(not 1 <= decision < len(self.dices) for decision in outcomes[0]):
+            return super().compute_distribution()
+        totals = [len(dice_outcomes) for dice_outcomes in outcomes]
+        block = prod(totals[1:])
+        decision_places: dict[int, tuple[list[int], dict[tuple[int, int], int]]] = {}
+        counts = Distribution()
+        for position, decision in enumerate(outcomes[0]):
+            if decision not in decision_places:
+                after = prod(totals[decision + 1 :])
+                offsets = _place_counts(
+                    prod(totals[1:decision]), totals[decision] * after, after, sides
+                )
+                places: dict[tuple[int, int], int] = {}
+                for index, result in enumerate(outcomes[decision]):
+                    key = (result, index * after % sides)
+                    places[key] = places.get(key, 0) + 1
+                decision_places[decision] = (offsets, places)
+            offsets, places = decision_places[decision]
+            start = self._rounds + position * block
+            total = sum(int(dice.max_side) for dice in self.dices[1 : decision + 1])
+            for (result, place), count in places.items():
+                for offset, offset_count in enumerate(offsets):
+                    if offset_count:
+                        rounds = (start + place + offset) % sides
+                        value = (result + total - rounds) % sides or sides
+                        counts[value] = counts.get(value, 0) + count * offset_count
+        self._rounds = (self._rounds + len(outcomes[0]) * block) % sides
+        return counts
+
     def __str__(self) -> str:
         dices_explain = ", ".join(str(dice) for dice in self.dices[1:])
         return f"ComposedDice({self.dices[0]}, [{dices_explain}])"
 
 
 class OneExtraSideDice(BiDice):
+    stateful = True
+
     def __init__(self, dice: BaseDice) -> None:
         self.max_side = dice.max_side + 1
         super().__init__(ModDice(SequentialDice(4), 2), dice)
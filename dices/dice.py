@@ -1,16 +1,202 @@
-from abc import ABC, abstractmethod
 import random
-from typing import Union, cast
+from abc import ABC, abstractmethod
+from bisect import bisect_right
+from collections.abc import Callable, Hashable, Iterator, Mapping
+from fractions import Fraction
+from typing import TYPE_CHECKING, Any, TypeVar, Union, cast
+
+import numpy as np
+
+from dices.cache import distribution_cache
+from dices.distribution import Approximation, Distribution, PrunedDistribution
+from dices.rng import DiceRng
+from dices.tables import alias_draw, alias_table
+
+if TYPE_CHECKING:
+    from dices.markov import MarkovChain
+    from dices.streaming import SimulationReport
 
 OutcomesData = list[
     tuple[list[int], int]
 ]  # A list of tuples, where each tuple contains a list of integers (the dice rolls) and an integer (the final result).
+Outcome = tuple[list[int], int]  # The dice rolls and the final result of one outcome.
 OutcomesMatriz = list[Union[int, "OutcomesMatriz"]]
+FoldState = TypeVar("FoldState", bound=Hashable)  # partial state of an exact fold
+OutcomeGrid = tuple[list[np.ndarray], np.ndarray]  # value axes and the results on them
+
+
+_rng = np.random.default_rng()
+
+# attributes about how a dice is rolled, not what it is: structure_key and the
+# states of dice.markov leave them out
+BOOKKEEPING_ATTRIBUTES = ("rng", "_choice", "_dices_state", "faithful_rolls")
+
+
+def seed_rng(seed: int | np.random.SeedSequence | None) -> None:
+    """Reseed the global generators used by dice that weren't given a DiceRng."""
+    global _rng
+    _rng = np.random.default_rng(seed)
+    random.seed(int(_rng.integers(2**63)))
+
+
+def results_array(values: list[int]) -> np.ndarray:
+    """Pack roll results into an int64 array, or an object array if they don't fit."""
+    try:
+        return np.array(values, dtype=np.int64)
+    except OverflowError:
+        return np.array(values, dtype=object)
+
+
+def map_unique(logic: Callable[..., int], *rolls: np.ndarray) -> np.ndarray:
+    """Apply logic once per distinct combination of rolls, instead of once per roll."""
+    stacked = np.stack(rolls)
+    if stacked.dtype == object or stacked.shape[1] == 0:
+        return results_array([logic(*column) for column in stacked.T.tolist()])
+    unique_columns, inverse = np.unique(stacked, axis=1, return_inverse=True)
+    unique_results = results_array(
+        [logic(*column) for column in unique_columns.T.tolist()]
+    )
+    return unique_results[inverse.reshape(-1)]
+
+
+def broadcast_grids(grids: list[OutcomeGrid]) -> tuple[list[np.ndarray], np.ndarray]:
+    """Lay the grids of several dices along their own axes of one shared grid.
+
+    Returns the axes of the shared grid and one row per dice, holding that
+    dice's result at every cell of it, flattened like roll_batch rolls."""
+    axes = [axis for dice_axes, _ in grids for axis in dice_axes]
+    shape = tuple(len(axis) for axis in axes)
+    rows = []
+    start = 0
+    for dice_axes, results in grids:
+        end = start + len(dice_axes)
+        after = (1,) * (len(shape) - end)
+        placed = results.reshape((1,) * start + results.shape + after)
+        rows.append(np.broadcast_to(placed, shape).ravel())
+        start = end
+    return axes, np.stack(rows)
+
+
+def add_sorted(rolls: tuple[int, ...], roll: int) -> tuple[int, ...]:
+    """rolls, sorted, with roll put in its place among them."""
+    place = bisect_right(rolls, roll)
+    return rolls[:place] + (roll,) + rolls[place:]
+
+
+def fits_int64(rolls: np.ndarray, bound: int) -> bool:
+    """Whether integer math on rolls can't overflow, given a bound on the result size."""
+    return rolls.dtype != object and bound < 2**63
+
+
+def _freeze(value: Any) -> Hashable:
+    """Turn an attribute of a dice into something hashable, for structure_key."""
+    if isinstance(value, BaseDice):
+        return value.structure_key()
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, np.ndarray):
+        return (value.dtype.str, value.shape, tuple(value.ravel().tolist()))
+    return cast(Hashable, value)
+
+
+class _Evaluation:
+    """What the running get_distribution call has worked out so far, per dice object.
+
+    Trees reuse the same dice object in many places, so inside one call each
+    object is walked once. Entries keep the dice alive, so its id can't be
+    taken by another object before the call ends."""
+
+    def __init__(self, approximation: Approximation | None = None) -> None:
+        self.approximation = approximation
+        self.states: dict[int, tuple[BaseDice, bool]] = {}
+        self.keys: dict[int, tuple[BaseDice, Hashable]] = {}
+        self.distributions: dict[int, tuple[BaseDice, Distribution]] = {}
+        self.errors: dict[int, tuple[BaseDice, Fraction, Fraction]] = {}
+        # what approximating the partial states of a dice's fold cost, see fold_step
+        self.fold_errors: dict[int, tuple[BaseDice, Fraction, Fraction]] = {}
+
+    def approximate(
+        self, dice: "BaseDice", counts: Distribution, computed: bool
+    ) -> Distribution:
+        """Simplify the counts of dice as the approximation allows, keeping its error.
+
+        When the counts were computed from the children, the children's errors
+        carry over, once per time the dice rolls them."""
+        if self.approximation is None:
+            return counts
+        counts, missing, moved = self.approximation.apply(counts)
+        if computed:
+            if id(dice) in self.fold_errors:
+                _, fold_missing, fold_moved = self.fold_errors.pop(id(dice))
+                missing += fold_missing
+                moved += fold_moved
+            for child in dice.get_children():
+                if id(child) in self.errors:
+                    _, child_missing, child_moved = self.errors[id(child)]
+                    missing += child_missing
+                    moved += child_moved
+        # the errors add up as a union bound, which can't say more than "all of it"
+        missing, moved = min(missing, Fraction(1)), min(moved, Fraction(1))
+        self.errors[id(dice)] = (dice, missing, moved)
+        return counts
+
+    def fold_step(
+        self,
+        dice: "BaseDice",
+        states: Mapping[FoldState, int],
+        dice_counts: Mapping[int, int],
+        combine: Callable[[FoldState, int], Hashable],
+    ) -> dict[Hashable, int]:
+        """Combine every state with every roll, approximating the new states as they come.
+
+        Integer states are rounded as soon as they are made, so the ones that
+        round the same merge before the next step multiplies them, and then the
+        least likely states are dropped. What that costs is added to dice's error."""
+        approximation = cast(Approximation, self.approximation)
+        new_states: dict[Hashable, int] = {}
+        moved_count = 0
+        for state, state_count in states.items():
+            for roll, roll_count in dice_counts.items():
+                new_state = combine(state, roll)
+                count = state_count * roll_count
+                if isinstance(new_state, int):
+                    rounded = approximation.round(new_state)
+                    if rounded != new_state:
+                        moved_count += count
+                        new_state = rounded
+                new_states[new_state] = new_states.get(new_state, 0) + count
+        total = sum(new_states.values())
+        dropped_count = approximation.drop(new_states, total)
+        if moved_count or dropped_count:
+            _, missing, moved = self.fold_errors.get(
+                id(dice), (dice, Fraction(0), Fraction(0))
+            )
+            missing += Fraction(dropped_count, total)
+            moved += Fraction(moved_count, total)
+            self.fold_errors[id(dice)] = (dice, missing, moved)
+        return new_states
+
+    def is_exact(self, dice: "BaseDice") -> bool:
+        if id(dice) not in self.errors:
+            return True
+        _, missing, moved = self.errors[id(dice)]
+        return missing == 0 and moved == 0
+
+
+_evaluation: _Evaluation | None = None  # set while a get_distribution call runs
 
 
 class BaseDice(ABC):
     """Base class for all dice types."""
 
+    stateful: bool = False  # True when rolling changes how the dice behaves next time
+    rng: DiceRng | None = None  # None means the global random and NumPy generators
+    # roll_batch may take shortcuts that give the same distribution without
+    # rolling every dice (see MultiDice); True rolls every dice like roll does
+    faithful_rolls: bool = False
+
     def __init__(self) -> None:
         self.max_side: float = 0.0
 
@@ -27,15 +213,66 @@ class BaseDice(ABC):
         """Simulate multiple rolls of the dice."""
         return [self.roll() for _ in range(num_rolls)]
 
-    def simulate_probabilities(self, num_rolls: int) -> dict[int, float]:
-        rolls = self.simulate_rolls(num_rolls)
-        counts: dict[int, int] = {}
-        for roll in rolls:
-            counts[roll] = counts.get(roll, 0) + 1
-        return {side: count / num_rolls for side, count in counts.items()}
-
-    def print_simulated_probs(self, num_rolls: int) -> None:
-        probabilities = self.simulate_probabilities(num_rolls)
+    def roll_batch(self, num_rolls: int) -> np.ndarray:
+        """Roll the dice num_rolls times at once, returning the results as an array.
+
+        Subclasses override this to draw all the rolls of their dices in one
+        go and combine them with array operations. Dice with state are
+        always rolled one at a time, since every roll affects the next."""
+        return results_array([self.roll() for _ in range(num_rolls)])
+
+    def simulate_probabilities(
+        self,
+        num_rolls: int,
+        vectorized: bool = True,
+        workers: int | None = 1,
+        seed: int | None = None,
+    ) -> dict[int, float]:
+        """Estimate the probabilities by rolling the dice num_rolls times.
+
+        The rolls are counted as they come, so they are never all in memory.
+        With workers other than 1 the rolls are split across a process pool
+        (None uses every core). With a seed the rolls are drawn from a DiceRng
+        seeded with it, so the same call gives the same estimate every time;
+        the dice draws from its own generators again afterwards."""
+        if workers != 1:
+            from dices.parallel import simulate_counts
+
+            return simulate_counts(self, num_rolls, workers, seed).to_floats()
+        rng = self.rng
+        if seed is not None:
+            self.set_rng(DiceRng(seed))
+        try:
+            if vectorized:
+                from dices.streaming import count_rolls
+
+                counts = count_rolls(self, num_rolls)
+            else:
+                counts = Distribution()
+                for _ in range(num_rolls):
+                    roll = self.roll()
+                    counts[roll] = counts.get(roll, 0) + 1
+        finally:
+            if seed is not None:
+                self.set_rng(rng)
+        return counts.to_floats()
+
+    def simulate_until(
+        self, precision: float, bound: str = "side", confidence: float = 0.95
+    ) -> "SimulationReport":
+        """Roll until the estimate is within precision, see dices.streaming."""
+        from dices.streaming import simulate_until
+
+        return simulate_until(self, precision, bound, confidence)
+
+    def markov_chain(self, rolls: int | None = None) -> "MarkovChain":
+        """The states this dice moves through as it rolls, see dices.markov."""
+        from dices.markov import build_chain
+
+        return build_chain(self, rolls)
+
+    def print_simulated_probs(self, num_rolls: int, workers: int | None = 1) -> None:
+        probabilities = self.simulate_probabilities(num_rolls, workers=workers)
         for side in sorted(probabilities.keys()):
             print(f"Side {side}: {probabilities[side]:.2%}")
 
@@ -43,47 +280,191 @@ class BaseDice(ABC):
     def get_outcomes(self) -> OutcomesData:
         pass
 
+    def iter_outcomes(self) -> Iterator[Outcome]:
+        """Yield the same outcomes as get_outcomes, one at a time.
+
+        Subclasses override this to walk the outcome space lazily, keeping
+        only the current path in memory instead of the whole list."""
+        yield from self.get_outcomes()
+
+    def get_children(self) -> list["BaseDice"]:
+        """The dices this dice rolls to get its own result."""
+        return []
+
+    def has_state(self) -> bool:
+        """Whether this dice or any dice it depends on is stateful."""
+        if _evaluation is not None and id(self) in _evaluation.states:
+            return _evaluation.states[id(self)][1]
+        state = self.stateful or any(dice.has_state() for dice in self.get_children())
+        if _evaluation is not None:
+            _evaluation.states[id(self)] = (self, state)
+        return state
+
+    def set_rng(self, rng: DiceRng | None) -> None:
+        """Make this dice and every dice it depends on draw from rng.
+
+        Pass None to go back to the global generators."""
+        self.rng = rng
+        for dice in self.get_children():
+            dice.set_rng(rng)
+
+    def set_faithful_rolls(self, faithful: bool) -> None:
+        """Set faithful_rolls on this dice and every dice it depends on."""
+        self.faithful_rolls = faithful
+        for dice in self.get_children():
+            dice.set_faithful_rolls(faithful)
+
+    def batch_generator(self) -> np.random.Generator:
+        """The NumPy generator roll_batch draws from."""
+        return self.rng.generator if self.rng is not None else _rng
+
+    def structure_key(self) -> Hashable:
+        """A key that is equal for two dice built the same way, from the same dices."""
+        if _evaluation is not None and id(self) in _evaluation.keys:
+            return _evaluation.keys[id(self)][1]
+        attributes = tuple(
+            sorted(
+                (name, _freeze(value))
+                for name, value in vars(self).items()
+                if name not in BOOKKEEPING_ATTRIBUTES
+            )
+        )
+        key = (type(self), attributes)
+        if _evaluation is not None and not self.has_state():
+            _evaluation.keys[id(self)] = (self, key)
+        return key
+
     def print_outcomes(self) -> None:
-        outcomes = self.get_outcomes()
-        for rolls, result in outcomes:
+        for rolls, result in self.iter_outcomes():
             rolls_str = ", ".join(str(roll) for roll in rolls)
             print(f"Rolls: [{rolls_str}] => Result: {result}")
 
     def outcomes_matriz(self) -> OutcomesMatriz:
-        outcomes = self.get_outcomes()
-        matriz: OutcomesMatriz = []
-        unique_values: list[list[int]] = []
-        for rolls, _ in outcomes:
-            if not unique_values:
-                for roll in rolls:
-                    unique_values.append([roll])
-            else:
-                for i, roll in enumerate(rolls):
-                    if roll not in unique_values[i]:
-                        unique_values[i].append(roll)
-
-        def build_matriz(level: int, current_rolls: list[int]) -> OutcomesMatriz | int:
-            if level == len(unique_values):
-                for rolls, result in outcomes:
-                    if rolls == current_rolls:
-                        return result
-                return 0  # should not happen
-            matriz_level: OutcomesMatriz = []
-            for value in unique_values[level]:
-                next_rolls = current_rolls + [value]
-                matriz_level.append(build_matriz(level + 1, next_rolls))
-            return matriz_level
-
-        matriz = cast(OutcomesMatriz, build_matriz(0, []))
-        return matriz
+        matriz, _ = self.outcomes_array()
+        return cast(OutcomesMatriz, matriz.tolist())
+
+    def outcomes_array(self) -> tuple[np.ndarray, list[np.ndarray]]:
+        """The outcomes as a dense array with one axis per roll, built in a single pass.
+
+        Also returns, for each axis, the roll value at each index along it (in
+        order of first appearance, like outcomes_matriz). Combinations of rolls
+        that never happen hold 0. Trees without state are built from the value
+        axes of their dices with array operations; the rest walk iter_outcomes."""
+        grid = self._outcome_grid()
+        if grid is not None:
+            axes_values, matriz = grid
+            if matriz.dtype != object and matriz.dtype != np.int64:
+                matriz = matriz.astype(np.int64)  # like results_array does
+            return matriz, axes_values
+        axes_indexes: list[dict[int, int]] = []
+        positions: list[list[int]] = []
+        results: list[int] = []
+        for rolls, result in self.iter_outcomes():
+            if not axes_indexes:
+                axes_indexes = [{} for _ in rolls]
+                positions = [[] for _ in rolls]
+            for axis, roll in enumerate(rolls):
+                indexes = axes_indexes[axis]
+                positions[axis].append(indexes.setdefault(roll, len(indexes)))
+            results.append(result)
+        shape = tuple(len(indexes) for indexes in axes_indexes)
+        values = results_array(results)
+        matriz = np.zeros(shape, dtype=values.dtype)
+        if results:
+            flat_positions = np.ravel_multi_index(positions, shape)
+            # when the same rolls appear twice, the first outcome wins
+            _, first = np.unique(flat_positions, return_index=True)
+            matriz.flat[flat_positions[first]] = values[first]
+        axes_values = [results_array(list(indexes)) for indexes in axes_indexes]
+        return matriz, axes_values
+
+    def _outcome_grid(self) -> OutcomeGrid | None:
+        # the value axes and results of outcomes_array, or None when they can't
+        # be built without walking the outcomes. A leaf has one axis, holding
+        # its sides, and each side is its own result
+        if self.get_children() or self.has_state():
+            return None
+        outcomes = list(self.iter_outcomes())
+        if not outcomes or any(rolls != [result] for rolls, result in outcomes):
+            return None
+        axis = results_array(list(dict.fromkeys(result for _, result in outcomes)))
+        return [axis], axis
+
+    def get_distribution(self) -> Distribution:
+        """Count how many outcomes lead to each result.
+
+        Results of dice without state are kept in the distribution cache, so
+        asking again for the same dice (or an equal one) is free. Within one
+        call, a dice object that appears several times in the tree is only
+        evaluated once; dice with state are evaluated at every appearance,
+        since each evaluation moves their state on."""
+        global _evaluation
+        if _evaluation is not None:
+            return self._evaluate(_evaluation)
+        _evaluation = _Evaluation()
+        try:
+            return Distribution(self._evaluate(_evaluation))
+        finally:
+            _evaluation = None
+
+    def sparse_distribution(
+        self, epsilon: float = 0.0, digits: int | None = None
+    ) -> PrunedDistribution:
+        """The distribution, kept small for dice with huge or very spread results.
+
+        Every dice in the tree may drop its least likely results, up to
+        epsilon of probability, and round results with more than digits
+        digits (see Approximation). The result says how much probability that
+        may have lost or moved in total."""
+        global _evaluation
+        if _evaluation is not None:
+            raise RuntimeError("sparse_distribution can't run inside get_distribution")
+        _evaluation = _Evaluation(Approximation(epsilon, digits))
+        try:
+            counts = self._evaluate(_evaluation)
+            _, missing, moved = _evaluation.errors[id(self)]
+            return PrunedDistribution(counts, missing, moved)
+        finally:
+            _evaluation = None
+
+    def _evaluate(self, evaluation: _Evaluation) -> Distribution:
+        # the result is shared between the parents of this dice, don't change it
+        if self.has_state():
+            return evaluation.approximate(self, self.compute_distribution(), True)
+        if id(self) in evaluation.distributions:
+            return evaluation.distributions[id(self)][1]
+        key = self.structure_key()
+        counts = distribution_cache.get(key)
+        if counts is None:
+            exact_counts = self.compute_distribution()
+            counts = evaluation.approximate(self, exact_counts, True)
+            # approximated counts must never be served as exact ones
+            if evaluation.is_exact(self):
+                distribution_cache.put(key, exact_counts)
+        else:
+            counts = evaluation.approximate(self, counts, False)
+        evaluation.distributions[id(self)] = (self, counts)
+        return counts
+
+    def compute_distribution(self) -> Distribution:
+        """Build the distribution without looking at the cache.
+
+        Subclasses override this to build the counts from their children's
+        distributions, so the full outcome space is never materialized."""
+        counts = Distribution()
+        for _, result in self.iter_outcomes():
+            counts[result] = counts.get(result, 0) + 1
+        return counts
+
+    def to_weighted(self) -> "WeightedDice":
+        """A WeightedDice with the exact distribution of this dice.
+
+        Rolling it is one step, instead of rolling every dice in the tree. For
+        dice with state it holds the distribution they have right now."""
+        return WeightedDice(self.get_distribution())
 
     def get_probabilities(self) -> dict[int, float]:
-        outcomes = self.get_outcomes()
-        counts: dict[int, int] = {}
-        for _, result in outcomes:
-            counts[result] = counts.get(result, 0) + 1
-        total_outcomes = len(outcomes)
-        return {side: count / total_outcomes for side, count in counts.items()}
+        return self.get_distribution().to_floats()
 
     def print_probabilities(self) -> None:
         probabilities = self.get_probabilities()
@@ -91,19 +472,39 @@ class BaseDice(ABC):
             print(f"Side {side}: {probabilities[side]:.2%}")
 
     def compare_dice(self, other: "BaseDice") -> dict[str, float]:
-        outcomes_self = self.get_outcomes()
-        outcomes_other = other.get_outcomes()
+        outcomes_self = self.get_distribution()
+        outcomes_other = other.get_distribution()
+        # sweep the smallest counts with the same probabilities, then scale the
+        # results back up to pairs of outcomes
+        counts_self = outcomes_self.normalized()
+        counts_other = outcomes_other.normalized()
+        scale = (outcomes_self.total() // (counts_self.total() or 1)) * (
+            outcomes_other.total() // (counts_other.total() or 1)
+        )
+        total_other = counts_other.total()
+        results_other = sorted(counts_other)
         wins_self = 0
         wins_other = 0
         ties = 0
-        for _, result_self in outcomes_self:
-            for _, result_other in outcomes_other:
-                if result_self > result_other:
-                    wins_self += 1
-                elif result_self < result_other:
-                    wins_other += 1
-                else:
-                    ties += 1
+        # sweep both sorted results together, keeping how many outcomes of
+        # the other dice are below the current result (its CDF)
+        below_other = 0
+        index_other = 0
+        for result_self in sorted(counts_self):
+            while (
+                index_other < len(results_other)
+                and results_other[index_other] < result_self
+            ):
+                below_other += counts_other[results_other[index_other]]
+                index_other += 1
+            count_self = counts_self[result_self]
+            equal_other = counts_other.get(result_self, 0)
+            wins_self += count_self * below_other
+            ties += count_self * equal_other
+            wins_other += count_self * (total_other - below_other - equal_other)
+        wins_self *= scale
+        wins_other *= scale
+        ties *= scale
         return {
             "self_win": wins_self,
             "other_win": wins_other,
@@ -154,15 +555,47 @@ class Dice(BaseDice):
     def __init__(self, sides: list[int]) -> None:
         self.sides = sides
         self.max_side = max(sides) if sides else 0
+        self._bind_choice()
+
+    def _bind_choice(self) -> None:
+        # roll calls whatever is bound here, so it never checks which generator to use
+        self._choice = random.choice if self.rng is None else self.rng.random.choice
 
     def roll(self) -> int:
-        return random.choice(self.sides)
+        choice = self._choice  # an instance attribute loads faster than a method call
+        return choice(self.sides)
+
+    def set_rng(self, rng: DiceRng | None) -> None:
+        super().set_rng(rng)
+        self._bind_choice()
+
+    def __getstate__(self) -> dict[str, Any]:
+        # copying the bound choice would copy the global random.Random with it
+        state = dict(vars(self))
+        state.pop("_choice", None)
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        vars(self).update(state)
+        self._bind_choice()
+
+    def roll_batch(self, num_rolls: int) -> np.ndarray:
+        if self.has_state():
+            return super().roll_batch(num_rolls)
+        return self.batch_generator().choice(results_array(self.sides), num_rolls)
 
     def get_outcomes(self) -> OutcomesData:
-        outcomes: OutcomesData = []
+        return list(self.iter_outcomes())
+
+    def iter_outcomes(self) -> Iterator[Outcome]:
+        for side in self.sides:
+            yield [side], side
+
+    def compute_distribution(self) -> Distribution:
+        counts = Distribution()
         for side in self.sides:
-            outcomes.append(([side], side))
-        return outcomes
+            counts[side] = counts.get(side, 0) + 1
+        return counts
 
     def __str__(self) -> str:
         return f"Dice({self.sides})"
@@ -179,54 +612,221 @@ class SequentialDice(Dice):
     def roll(self) -> int:
         return self.dice.roll()
 
+    def roll_batch(self, num_rolls: int) -> np.ndarray:
+        return self.batch_generator().integers(1, self.num_sides + 1, num_rolls)
+
+    def set_rng(self, rng: DiceRng | None) -> None:
+        super().set_rng(rng)
+        self.dice.set_rng(rng)
+
     def get_outcomes(self) -> OutcomesData:
-        outcomes: OutcomesData = []
+        return list(self.iter_outcomes())
+
+    def iter_outcomes(self) -> Iterator[Outcome]:
         for side in range(1, self.num_sides + 1):
-            outcomes.append(([side], side))
-        return outcomes
+            yield [side], side
+
+    def compute_distribution(self) -> Distribution:
+        return Distribution({side: 1 for side in range(1, self.num_sides + 1)})
 
     def __str__(self) -> str:
         return f"SequentialDice({self.num_sides})"
 
 
+class WeightedDice(BaseDice):
+    """Dice where each side has a weight, rolled through an alias table.
+
+    Same distribution as a Dice that repeats each side weight times, but it
+    only keeps one entry per side and every roll costs the same, however
+    uneven the weights are."""
+
+    def __init__(self, weights: dict[int, int]) -> None:
+        if any(weight <= 0 for weight in weights.values()):
+            raise ValueError("WeightedDice weights must be positive")
+        self.sides = sorted(weights)
+        self.weights = {side: weights[side] for side in self.sides}
+        self.total = sum(self.weights.values())
+        # the table only needs the proportions, so it works on the smallest weights
+        table_weights = list(Distribution(self.weights).normalized().values())
+        self.table_total = sum(table_weights)
+        self.thresholds, self.aliases = alias_table(table_weights)
+        self.max_side = max(self.sides) if self.sides else 0
+        # NumPy can only draw below 2**63, past that roll_batch rolls one at a time
+        self.batch_table: tuple[np.ndarray, np.ndarray] | None = None
+        if self.table_total < 2**63:
+            self.batch_table = (
+                np.array(self.thresholds, dtype=np.int64),
+                np.array(self.aliases, dtype=np.int64),
+            )
+
+    def roll(self) -> int:
+        source = random if self.rng is None else self.rng.random
+        side = source.randrange(len(self.sides))
+        if source.randrange(self.table_total) >= self.thresholds[side]:
+            side = self.aliases[side]
+        return self.sides[side]
+
+    def roll_batch(self, num_rolls: int) -> np.ndarray:
+        if self.batch_table is None:
+            return super().roll_batch(num_rolls)
+        thresholds, aliases = self.batch_table
+        chosen = alias_draw(
+            self.batch_generator(), thresholds, aliases, self.table_total, num_rolls
+        )
+        return results_array(self.sides)[chosen]
+
+    def get_outcomes(self) -> OutcomesData:
+        return list(self.iter_outcomes())
+
+    def iter_outcomes(self) -> Iterator[Outcome]:
+        # one outcome per unit of weight, like the sides of the equivalent Dice
+        for side, weight in self.weights.items():
+            for _ in range(weight):
+                yield [side], side
+
+    def compute_distribution(self) -> Distribution:
+        return Distribution(self.weights)
+
+    def __str__(self) -> str:
+        return f"WeightedDice({self.weights})"
+
+
 class DiceOfDices(BaseDice):
+    # the dices dices_have_state last looked at, their ids and the answer
+    _dices_state: tuple[tuple[BaseDice, ...], tuple[int, ...], bool] | None = None
+
     def __init__(self, dices: list[BaseDice]) -> None:
         self.dices = dices
 
+    def dices_have_state(self) -> bool:
+        """Whether any of the dices has state, remembered until the dices change.
+
+        Rolls that skip some of the dices ask this every time, and walking
+        the whole tree for it costs more than the roll itself. The dices are
+        kept with the answer, so their ids can't be reused while it is kept."""
+        ids = tuple(map(id, self.dices))
+        if self._dices_state is None or self._dices_state[1] != ids:
+            state = any(dice.has_state() for dice in self.dices)
+            self._dices_state = (tuple(self.dices), ids, state)
+        return self._dices_state[2]
+
     @abstractmethod
     def apply_logic(self, rolls: list[int]) -> int:
         pass
 
+    def apply_logic_batch(self, rolls: np.ndarray) -> np.ndarray:
+        """apply_logic for many rolls at once. rolls has one row per dice.
+
+        The default calls apply_logic once per distinct combination of rolls;
+        subclasses override it with array operations."""
+        return map_unique(lambda *column: self.apply_logic(list(column)), *rolls)
+
     def roll(self) -> int:
         rolls = [dice.roll() for dice in self.dices]
         return self.apply_logic(rolls)
 
+    def roll_batch(self, num_rolls: int) -> np.ndarray:
+        if self.has_state():
+            return super().roll_batch(num_rolls)
+        rolls = np.stack([dice.roll_batch(num_rolls) for dice in self.dices])
+        return self.apply_logic_batch(rolls)
+
     def __str__(self) -> str:
         dices_str = ", ".join(str(dice) for dice in self.dices)
         return f"DiceOfDices([{dices_str}])"
 
-    def get_outcomes(self) -> list[tuple[list[int], int]]:
-        outcomes_calculator: list[tuple[list[int], list[int]]] = []
-        for dice in self.dices:
-            new_outcomes_calculator: list[tuple[list[int], list[int]]] = []
-            dice_outcomes = dice.get_outcomes()  # list of (rolls, result)
-            if not outcomes_calculator:
-                for dice_rolls, dice_result in dice_outcomes:
-                    new_outcomes_calculator.append((dice_rolls, [dice_result]))
-            else:
-                for existing_rolls, existing_results in outcomes_calculator:
-                    for dice_rolls, dice_result in dice_outcomes:
-                        combined_rolls = existing_rolls + dice_rolls
-                        combined_results = existing_results + [dice_result]
-                        new_outcomes_calculator.append(
-                            (combined_rolls, combined_results)
-                        )
-            outcomes_calculator = new_outcomes_calculator
-        final_outcomes: OutcomesData = []
-        for rolls, results in outcomes_calculator:
-            final_result = self.apply_logic(results)
-            final_outcomes.append((rolls, final_result))
-        return final_outcomes
+    # Exact evaluation folds the children one at a time into a partial state.
+    # By default the state is the tuple of rolls seen so far, which works for
+    # any apply_logic; subclasses override these three hooks with a smaller
+    # state (a running sum, a max, ...) so that equal states merge and the
+    # work scales with the number of distinct states instead of the outcomes.
+    # Subclasses whose result doesn't depend on the order of the rolls can
+    # instead set order_matters to False: the default state is then kept
+    # sorted, so rolls that only differ in order merge.
+
+    order_matters = True
+
+    def fold_start(self) -> Hashable:
+        return ()
+
+    def fold_roll(self, state: Hashable, index: int, roll: int) -> Hashable:
+        rolls = cast(tuple[int, ...], state)
+        return rolls + (roll,) if self.order_matters else add_sorted(rolls, roll)
+
+    def fold_result(self, state: Hashable) -> int:
+        return self.apply_logic(list(cast(tuple[int, ...], state)))
+
+    def compute_distribution(self) -> Distribution:
+        if self.stateful:
+            return super().compute_distribution()
+        states: dict[Hashable, int] = {self.fold_start(): 1}
+        evaluation = _evaluation
+        for index, dice in enumerate(self.dices):
+            dice_counts = dice.get_distribution()
+            if evaluation is not None and evaluation.approximation is not None:
+
+                def combine(state: Hashable, roll: int, index: int = index) -> Hashable:
+                    return self.fold_roll(state, index, roll)
+
+                states = evaluation.fold_step(self, states, dice_counts, combine)
+                continue
+            new_states: dict[Hashable, int] = {}
+            for state, state_count in states.items():
+                for roll, roll_count in dice_counts.items():
+                    new_state = self.fold_roll(state, index, roll)
+                    new_states[new_state] = (
+                        new_states.get(new_state, 0) + state_count * roll_count
+                    )
+            states = new_states
+        counts = Distribution()
+        for state, state_count in states.items():
+            result = self.fold_result(state)
+            counts[result] = counts.get(result, 0) + state_count
+        return counts
+
+    def get_outcomes(self) -> OutcomesData:
+        return list(self.iter_outcomes())
+
+    def get_children(self) -> list[BaseDice]:
+        return self.dices
+
+    def _outcome_grid(self) -> OutcomeGrid | None:
+        if type(self).iter_outcomes is not DiceOfDices.iter_outcomes:
+            return None
+        if not self.dices or self.has_state():
+            return None
+        grids = [dice._outcome_grid() for dice in self.dices]
+        if any(grid is None for grid in grids):
+            return None
+        axes, rows = broadcast_grids(cast(list[OutcomeGrid], grids))
+        results = self.apply_logic_batch(rows)
+        return axes, results.reshape(tuple(len(axis) for axis in axes))
+
+    def iter_outcomes(self) -> Iterator[Outcome]:
+        # a dice with state would change if enumerated again for every prefix,
+        # so those are enumerated once up front, like get_outcomes always did
+        fixed_outcomes = [
+            dice.get_outcomes() if dice.has_state() else None for dice in self.dices
+        ]
+        rolls: list[int] = []
+        results: list[int] = []
+
+        def expand(index: int) -> Iterator[Outcome]:
+            if index == len(self.dices):
+                yield list(rolls), self.apply_logic(list(results))
+                return
+            fixed = fixed_outcomes[index]
+            dice_outcomes: Iterator[Outcome] = (
+                iter(fixed) if fixed is not None else self.dices[index].iter_outcomes()
+            )
+            for dice_rolls, dice_result in dice_outcomes:
+                rolls.extend(dice_rolls)
+                results.append(dice_result)
+                yield from expand(index + 1)
+                del rolls[len(rolls) - len(dice_rolls) :]
+                results.pop()
+
+        yield from expand(0)
 
 
 class BiDice(BaseDice):
@@ -238,20 +838,78 @@ class BiDice(BaseDice):
     def apply_logic(self, roll_a: int, roll_b: int) -> int:
         pass
 
+    def apply_logic_batch(self, rolls_a: np.ndarray, rolls_b: np.ndarray) -> np.ndarray:
+        """apply_logic for many rolls at once.
+
+        The default calls apply_logic once per distinct pair of rolls;
+        subclasses override it with array operations."""
+        return map_unique(self.apply_logic, rolls_a, rolls_b)
+
     def roll(self) -> int:
         roll_a = self.dice_a.roll()
         roll_b = self.dice_b.roll()
         return self.apply_logic(roll_a, roll_b)
 
+    def roll_batch(self, num_rolls: int) -> np.ndarray:
+        if self.has_state():
+            return super().roll_batch(num_rolls)
+        rolls_a = self.dice_a.roll_batch(num_rolls)
+        rolls_b = self.dice_b.roll_batch(num_rolls)
+        return self.apply_logic_batch(rolls_a, rolls_b)
+
     def get_outcomes(self) -> OutcomesData:
-        outcomes: OutcomesData = []
-        dice_a_outcomes = self.dice_a.get_outcomes()
-        dice_b_outcomes = self.dice_b.get_outcomes()
+        return list(self.iter_outcomes())
+
+    def get_children(self) -> list[BaseDice]:
+        return [self.dice_a, self.dice_b]
+
+    def _outcome_grid(self) -> OutcomeGrid | None:
+        if type(self).iter_outcomes is not BiDice.iter_outcomes or self.has_state():
+            return None
+        grid_a, grid_b = self.dice_a._outcome_grid(), self.dice_b._outcome_grid()
+        if grid_a is None or grid_b is None:
+            return None
+        axes, (rolls_a, rolls_b) = broadcast_grids([grid_a, grid_b])
+        results = self.apply_logic_batch(rolls_a, rolls_b)
+        return axes, results.reshape(tuple(len(axis) for axis in axes))
+
+    def iter_outcomes(self) -> Iterator[Outcome]:
+        # same as DiceOfDices: dices with state are enumerated once, in order
+        dice_a_fixed = self.dice_a.get_outcomes() if self.dice_a.has_state() else None
+        dice_b_fixed = self.dice_b.get_outcomes() if self.dice_b.has_state() else None
+        dice_a_outcomes: Iterator[Outcome] = (
+            iter(dice_a_fixed)
+            if dice_a_fixed is not None
+            else self.dice_a.iter_outcomes()
+        )
         for rolls_a, result_a in dice_a_outcomes:
+            dice_b_outcomes: Iterator[Outcome] = (
+                iter(dice_b_fixed)
+                if dice_b_fixed is not None
+                else self.dice_b.iter_outcomes()
+            )
             for rolls_b, result_b in dice_b_outcomes:
                 total_result = self.apply_logic(result_a, result_b)
-                outcomes.append((rolls_a + rolls_b, total_result))
-        return outcomes
+                yield rolls_a + rolls_b, total_result
+
+    def compute_distribution(self) -> Distribution:
+        if self.stateful:
+            return super().compute_distribution()
+        counts = Distribution()
+        counts_a = self.dice_a.get_distribution()
+        counts_b = self.dice_b.get_distribution()
+        evaluation = _evaluation
+        if evaluation is not None and evaluation.approximation is not None:
+            # round the results as they are made, not after all the pairs
+            pairs = evaluation.fold_step(self, counts_a, counts_b, self.apply_logic)
+            return Distribution(cast(dict[int, int], pairs))
+        for result_a, count_a in counts_a.items():
+            for result_b, count_b in counts_b.items():
+                total_result = self.apply_logic(result_a, result_b)
+                counts[total_result] = (
+                    counts.get(total_result, 0) + count_a * count_b
+                )
+        return counts
 
 
 class AlterDice(BaseDice):
@@ -263,17 +921,49 @@ class AlterDice(BaseDice):
     def apply_logic(self, roll: int) -> int:
         pass
 
+    def apply_logic_batch(self, rolls: np.ndarray) -> np.ndarray:
+        """apply_logic for many rolls at once.
+
+        The default calls apply_logic once per distinct roll; subclasses
+        override it with array operations."""
+        return map_unique(self.apply_logic, rolls)
+
     def roll(self) -> int:
         roll = self.die.roll()
         return self.apply_logic(roll)
 
+    def roll_batch(self, num_rolls: int) -> np.ndarray:
+        if self.has_state():
+            return super().roll_batch(num_rolls)
+        return self.apply_logic_batch(self.die.roll_batch(num_rolls))
+
     def get_outcomes(self) -> OutcomesData:
-        outcomes: OutcomesData = []
-        dice_outcomes = self.die.get_outcomes()
-        for rolls, result in dice_outcomes:
+        return list(self.iter_outcomes())
+
+    def get_children(self) -> list[BaseDice]:
+        return [self.die]
+
+    def _outcome_grid(self) -> OutcomeGrid | None:
+        if type(self).iter_outcomes is not AlterDice.iter_outcomes:
+            return None
+        grid = None if self.has_state() else self.die._outcome_grid()
+        if grid is None:
+            return None
+        axes, rolls = grid
+        return axes, self.apply_logic_batch(rolls.ravel()).reshape(rolls.shape)
+
+    def iter_outcomes(self) -> Iterator[Outcome]:
+        for rolls, result in self.die.iter_outcomes():
+            yield rolls, self.apply_logic(result)
+
+    def compute_distribution(self) -> Distribution:
+        if self.stateful:
+            return super().compute_distribution()
+        counts = Distribution()
+        for result, count in self.die.get_distribution().items():
             total_result = self.apply_logic(result)
-            outcomes.append((rolls, total_result))
-        return outcomes
+            counts[total_result] = counts.get(total_result, 0) + count
+        return counts
 
 
 class FunctionDice(BaseDice):
@@ -285,14 +975,46 @@ class FunctionDice(BaseDice):
     def apply_logic(self, roll: int) -> int:
         pass
 
+    def apply_logic_batch(self, rolls: np.ndarray) -> np.ndarray:
+        """apply_logic for many rolls at once.
+
+        The default calls apply_logic once per distinct roll; subclasses
+        override it with array operations."""
+        return map_unique(self.apply_logic, rolls)
+
     def roll(self) -> int:
         roll = self.die.roll()
         return self.apply_logic(roll)
 
+    def roll_batch(self, num_rolls: int) -> np.ndarray:
+        if self.has_state():
+            return super().roll_batch(num_rolls)
+        return self.apply_logic_batch(self.die.roll_batch(num_rolls))
+
     def get_outcomes(self) -> OutcomesData:
-        outcomes: OutcomesData = []
-        dice_outcomes = self.die.get_outcomes()
-        for rolls, result in dice_outcomes:
+        return list(self.iter_outcomes())
+
+    def get_children(self) -> list[BaseDice]:
+        return [self.die]
+
+    def _outcome_grid(self) -> OutcomeGrid | None:
+        if type(self).iter_outcomes is not FunctionDice.iter_outcomes:
+            return None
+        grid = None if self.has_state() else self.die._outcome_grid()
+        if grid is None:
+            return None
+        axes, rolls = grid
+        return axes, self.apply_logic_batch(rolls.ravel()).reshape(rolls.shape)
+
+    def iter_outcomes(self) -> Iterator[Outcome]:
+        for rolls, result in self.die.iter_outcomes():
+            yield rolls, self.apply_logic(result)
+
+    def compute_distribution(self) -> Distribution:
+        if self.stateful:
+            return super().compute_distribution()
+        counts = Distribution()
+        for result, count in self.die.get_distribution().items():
             total_result = self.apply_logic(result)
-            outcomes.append((rolls, total_result))
-        return outcomes
+            counts[total_result] = counts.get(total_result, 0) + count
+        return counts
@@ -0,0 +1,199 @@
+from collections.abc import Hashable
+from fractions import Fraction
+from functools import cache
+from math import gcd, log10
+from typing import TypeVar
+
+import numpy as np
+
+"""This module contains Distribution, the exact result counts of a dice.
+
+Probabilities are always count / total, with total the sum of the counts, so
+they stay exact integers until someone asks for a float."""
+
+Key = TypeVar("Key", bound=Hashable)  # anything Approximation.drop can count
+
+
+class Distribution(dict[int, int]):
+    """Maps each final result to the number of outcomes (dice rolls) that produce it.
+
+    It is a dict, so == compares the counts themselves; same_as compares the
+    probabilities, which is what two dice with different outcome spaces share."""
+
+    def total(self) -> int:
+        return sum(self.values())
+
+    def probability(self, result: int) -> Fraction:
+        return Fraction(self.get(result, 0), self.total())
+
+    def probabilities(self) -> dict[int, Fraction]:
+        total = self.total()
+        return {result: Fraction(count, total) for result, count in self.items()}
+
+    def to_floats(self) -> dict[int, float]:
+        """Probabilities as floats, each rounded once from the exact count / total."""
+        total = self.total()
+        return {result: count / total for result, count in self.items()}
+
+    def normalized(self) -> "Distribution":
+        """The same probabilities with the smallest whole counts."""
+        divisor = gcd(*self.values())
+        if divisor <= 1:
+            return Distribution(self)
+        return Distribution(
+            {result: count // divisor for result, count in self.items()}
+        )
+
+    def scaled(self, factor: int) -> "Distribution":
+        return Distribution({result: count * factor for result, count in self.items()})
+
+    def same_as(self, other: dict[int, int]) -> bool:
+        """Whether both give every result with exactly the same probability."""
+        total = self.total()
+        other_total = sum(other.values())
+        results = set(self) | set(other)
+        return all(
+            self.get(result, 0) * other_total == other.get(result, 0) * total
+            for result in results
+        )
+
+    def merge(self, other: dict[int, int]) -> None:
+        """Add the counts of other to these, in place, like pooling two sets of rolls."""
+        for result, count in other.items():
+            self[result] = self.get(result, 0) + count
+
+    def convolve(self, other: "Distribution") -> "Distribution":
+        """Counts of a result of these plus a result of other, over every pair of them."""
+        if self.is_dense() and other.is_dense():
+            low, counts = self.to_array()
+            other_low, other_counts = other.to_array()
+            # object arrays, so products of large counts don't overflow
+            summed = np.convolve(counts.astype(object), other_counts.astype(object))
+            return Distribution.from_array(low + other_low, summed)
+        summed_counts = Distribution()
+        for result, count in self.items():
+            for other_result, other_count in other.items():
+                total = result + other_result
+                summed_counts[total] = summed_counts.get(total, 0) + count * other_count
+        return summed_counts
+
+    def is_dense(self) -> bool:
+        """Whether most integers between the lowest and highest result appear."""
+        return bool(self) and 2 * len(self) >= max(self) - min(self) + 1
+
+    def to_array(self) -> tuple[int, np.ndarray]:
+        """The lowest result and the counts of every integer from it up to the highest.
+
+        The array is int64 when the counts fit, otherwise it holds Python ints."""
+        if not self:
+            return 0, np.zeros(0, dtype=np.int64)
+        low = min(self)
+        size = max(self) - low + 1
+        dtype = np.int64 if max(self.values()) < 2**63 else object
+        counts = np.zeros(size, dtype=dtype)
+        for result, count in self.items():
+            counts[result - low] = count
+        return low, counts
+
+    @classmethod
+    def from_array(cls, low: int, counts: np.ndarray) -> "Distribution":
+        """Inverse of to_array, dropping the results that never happen."""
+        return cls(
+            {
+                low + offset: int(count)
+                for offset, count in enumerate(counts.tolist())
+                if count
+            }
+        )
+
+
+@cache
+def _power_of_ten(exponent: int) -> int:
+    return 10**exponent
+
+
+def _decimal_digits(value: int) -> int:
+    # str() refuses ints this large, so go from the bit length instead
+    digits = max(int((value.bit_length() - 1) * log10(2)), 0) + 1
+    while _power_of_ten(digits) <= value:
+        digits += 1
+    while digits > 1 and _power_of_ten(digits - 1) > value:
+        digits -= 1
+    return digits
+
+
+class PrunedDistribution(Distribution):
+    """A Distribution that may have lost or moved some probability on the way.
+
+    missing bounds the probability of the results that were dropped, and moved
+    the probability of the results that were rounded somewhere in the tree, so
+    the total variation distance to the exact distribution is at most their sum."""
+
+    def __init__(
+        self, counts: dict[int, int], missing: Fraction, moved: Fraction
+    ) -> None:
+        super().__init__(counts)
+        self.missing = missing
+        self.moved = moved
+
+    def error(self) -> Fraction:
+        return self.missing + self.moved
+
+
+class Approximation:
+    """How sparse_distribution may simplify the distribution of every dice in a tree.
+
+    epsilon is the probability each dice may drop, taken from its least likely
+    results, and digits the significant digits kept of results too large to
+    write with that many digits. Results small enough are never rounded."""
+
+    def __init__(self, epsilon: float = 0.0, digits: int | None = None) -> None:
+        if not 0 <= epsilon < 1:
+            raise ValueError("epsilon must be at least 0 and below 1")
+        if digits is not None and digits < 1:
+            raise ValueError("digits must be at least 1")
+        self.epsilon = Fraction(epsilon)
+        self.digits = digits
+        self.limit = 10**digits if digits is not None else 0  # below it, nothing to round
+
+    def round(self, result: int) -> int:
+        if self.digits is None or -self.limit < result < self.limit:
+            return result
+        extra_digits = _decimal_digits(abs(result)) - self.digits
+        if extra_digits <= 0:
+            return result
+        unit = _power_of_ten(extra_digits)
+        rounded = abs(result) // unit * unit
+        return rounded if result >= 0 else -rounded
+
+    def apply(self, counts: dict[int, int]) -> tuple[Distribution, Fraction, Fraction]:
+        """The simplified counts, the probability dropped and the probability moved."""
+        total = sum(counts.values())
+        rounded = Distribution()
+        moved_count = 0
+        for result, count in counts.items():
+            new_result = self.round(result)
+            if new_result != result:
+                moved_count += count
+            rounded[new_result] = rounded.get(new_result, 0) + count
+        dropped_count = self.drop(rounded, total)
+        if total == 0:
+            return rounded, Fraction(0), Fraction(0)
+        return rounded, Fraction(dropped_count, total), Fraction(moved_count, total)
+
+    def drop(self, counts: dict[Key, int], total: int) -> int:
+        """Remove the least likely entries of counts, up to epsilon of total, in place.
+
+        Works on any keys, like the partial states of a fold. Returns the count removed."""
+        if not self.epsilon:
+            return 0
+        budget = self.epsilon * total
+        dropped_count = 0
+        for key in sorted(counts, key=counts.__getitem__):
+            if dropped_count + counts[key] > budget:
+                break
+            dropped_count += counts.pop(key)
+        return dropped_count
+
+    def __str__(self) -> str:
+        return f"Approximation(epsilon={float(self.epsilon)}, digits={self.digits})"
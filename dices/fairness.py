@@ -0,0 +1,208 @@
+import copy
+import os
+from collections.abc import Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from fractions import Fraction
+from itertools import product
+
+from dices.catalog import load_catalog
+from dices.dice import AlterDice, BaseDice, BiDice, DiceOfDices, FunctionDice
+from dices.distribution import Distribution
+
+"""This module checks, with exact fractions, how fair the dices of from_1_to_100 are.
+
+Dices like OneExtraSideDice change with every roll, so the distribution from
+get_distribution (which moves the state once per enumerated outcome) is not
+what a player sees. Here every roll is followed instead: the distribution of
+one roll is computed with the state as it is, then the state moves on the way
+a roll moves it, until all the states in the tree are back where they began.
+Run `python -m dices.fairness` to check the whole catalog."""
+
+MAX_ROUNDS = 1_000_000  # give up on trees whose state doesn't come back by then
+
+
+def children_logic(dice: BaseDice) -> tuple[list[BaseDice], Callable[[list[int]], int]]:
+    """The dices one roll of dice rolls, in order, and how it combines their rolls."""
+    if isinstance(dice, BiDice):
+        return [dice.dice_a, dice.dice_b], lambda rolls: dice.apply_logic(*rolls)
+    if isinstance(dice, DiceOfDices):
+        return dice.dices, dice.apply_logic
+    if isinstance(dice, (AlterDice, FunctionDice)):
+        return [dice.die], lambda rolls: dice.apply_logic(rolls[0])
+    raise ValueError(f"can't follow the state of {type(dice).__name__} roll by roll")
+
+
+def roll_distribution(dice: BaseDice) -> Distribution:
+    """Exact distribution of the next roll, then move the state on like that roll would.
+
+    The state of a dice has to move the same way whatever is rolled, which is
+    true for the counters of OneExtraSideDice, ComposedDice and CarouselDice."""
+    if not dice.has_state():
+        return dice.get_distribution()
+    children, logic = children_logic(dice)
+    # children roll in order, so a dice used twice is at its next state the second time
+    children_counts = [roll_distribution(child) for child in children]
+    state = dict(vars(dice))
+    counts = Distribution()
+    for combination in product(
+        *(child_counts.items() for child_counts in children_counts)
+    ):
+        result = logic([roll for roll, _ in combination])
+        vars(dice).update(state)
+        weight = 1
+        for _, count in combination:
+            weight *= count
+        counts[result] = counts.get(result, 0) + weight
+    if dice.stateful:
+        logic([next(iter(child_counts)) for child_counts in children_counts])
+    return counts
+
+
+def state_nodes(dice: BaseDice, nodes: dict[int, BaseDice]) -> dict[int, BaseDice]:
+    """Add every stateful dice in the tree of dice to nodes, keyed on its id."""
+    if dice.stateful:
+        nodes[id(dice)] = dice
+    for child in dice.get_children():
+        state_nodes(child, nodes)
+    return nodes
+
+
+def _snapshot(nodes: list[BaseDice]) -> tuple[object, ...]:
+    return tuple(
+        tuple(
+            (name, value)
+            for name, value in sorted(vars(node).items())
+            if isinstance(value, (int, float, str))
+        )
+        for node in nodes
+    )
+
+
+def _deviation(counts: Distribution, sides: int) -> Fraction:
+    uniform = Fraction(1, sides)
+    probabilities = counts.probabilities()
+    results = set(counts) | set(range(1, sides + 1))
+    return max(
+        abs(
+            probabilities.get(result, Fraction(0))
+            - (uniform if 1 <= result <= sides else 0)
+        )
+        for result in results
+    )
+
+
+class FairnessReport:
+    """How far one dice is from a fair dice with the given number of sides.
+
+    roll_deviation is the worst gap to 1/sides over any single roll,
+    cycle_deviation the gap of the average over the rounds it takes the state
+    to come back, and enumerated_deviation the gap of get_distribution."""
+
+    def __init__(
+        self,
+        sides: int,
+        rounds: int,
+        roll_deviation: Fraction,
+        cycle_deviation: Fraction,
+        enumerated_deviation: Fraction,
+    ) -> None:
+        self.sides = sides
+        self.rounds = rounds
+        self.roll_deviation = roll_deviation
+        self.cycle_deviation = cycle_deviation
+        self.enumerated_deviation = enumerated_deviation
+
+    def is_fair(self) -> bool:
+        """Fair in the long run: every side comes up 1/sides of the time."""
+        return self.cycle_deviation == 0
+
+    def __str__(self) -> str:
+        verdict = "fair" if self.is_fair() else "unfair"
+        return (
+            f"d{self.sides:<3} {verdict:6} rounds {self.rounds:>6}  "
+            f"per roll {float(self.roll_deviation):8.4%}  "
+            f"over the rounds {float(self.cycle_deviation):8.4%}  "
+            f"enumerated {float(self.enumerated_deviation):8.4%}"
+        )
+
+
+def cycle_rolls(dice: BaseDice) -> Iterator[Distribution]:
+    """Exact distribution of every roll until the state of dice is back where it began.
+
+    A dice without state gives a single distribution. The state of dice is
+    back where it started once every distribution has been taken."""
+    nodes = list(state_nodes(dice, {}).values())
+    start = _snapshot(nodes)
+    rounds = 0
+    while rounds == 0 or _snapshot(nodes) != start:
+        if rounds >= MAX_ROUNDS:
+            raise ValueError(
+                f"{dice} did not come back to its state in {MAX_ROUNDS} rolls"
+            )
+        yield roll_distribution(dice)
+        rounds += 1
+
+
+def cycle_distribution(dice: BaseDice) -> Distribution:
+    """Counts of the results of dice over the rolls it takes its state to come back.
+
+    These are the long run frequencies of roll: a dice without state gives
+    its get_distribution, and a dice with state the sum over the cycle."""
+    cycle_counts = Distribution()
+    for counts in cycle_rolls(dice):
+        # every roll has the same number of outcomes, so the counts add up as they are
+        cycle_counts.merge(counts)
+    return cycle_counts
+
+
+def verify_dice(dice: BaseDice, sides: int) -> FairnessReport:
+    """Exact fairness of dice against a fair dice with sides sides.
+
+    The state of dice is back where it started when this returns, apart from
+    the get_distribution call at the end."""
+    cycle_counts = Distribution()
+    roll_deviation = Fraction(0)
+    rounds = 0
+    for counts in cycle_rolls(dice):
+        roll_deviation = max(roll_deviation, _deviation(counts, sides))
+        cycle_counts.merge(counts)
+        rounds += 1
+    cycle_deviation = _deviation(cycle_counts, sides)
+    enumerated_deviation = _deviation(dice.get_distribution(), sides)
+    return FairnessReport(
+        sides, rounds, roll_deviation, cycle_deviation, enumerated_deviation
+    )
+
+
+_catalog: list[BaseDice] = []
+
+
+def _verify_catalog_dice(sides: int) -> FairnessReport:
+    # every dice is checked on its own copy of the freshly built catalog, so
+    # the states other checks left behind in shared dices don't leak in
+    if not _catalog:
+        _catalog.extend(copy.deepcopy(load_catalog()))
+    return verify_dice(copy.deepcopy(_catalog[sides]), sides)
+
+
+def verify_catalog(workers: int | None = None) -> list[FairnessReport]:
+    """FairnessReport for d1 to d100 of from_1_to_100, checked across a process pool.
+
+    None uses every core, and 1 checks them all in this process."""
+    sides_range = range(1, 101)
+    if workers == 1:
+        return [_verify_catalog_dice(sides) for sides in sides_range]
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        return list(pool.map(_verify_catalog_dice, sides_range))
+
+
+def main() -> None:
+    reports = verify_catalog()
+    for report in reports:
+        print(report)
+    fair = sum(report.is_fair() for report in reports)
+    print(f"\n{fair} of {len(reports)} dices are fair over their rounds")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,37 @@
-from dices.dice import BaseDice, DiceOfDices
+from collections.abc import Hashable
+from typing import cast
+
+import numpy as np
+
+from dices.dice import BaseDice, DiceOfDices, add_sorted
+from dices.distribution import Distribution
+
+
+def extreme_distribution(dices: list[BaseDice], highest: bool) -> Distribution:
+    """Distribution of the highest (or lowest) roll of independent dices.
+
+    The highest roll is at most x exactly when every roll is, so the counts
+    up to x are the product of each dice's counts up to x, and one pass over
+    the results is enough. A dice object used several times is raised to a power."""
+    groups: dict[int, tuple[BaseDice, int]] = {}
+    for dice in dices:
+        amount = groups[id(dice)][1] if id(dice) in groups else 0
+        groups[id(dice)] = (dice, amount + 1)
+    children = [(dice.get_distribution(), amount) for dice, amount in groups.values()]
+    all_results = set().union(*(child_counts for child_counts, _ in children))
+    results = sorted(all_results, reverse=not highest)
+    reached = [0] * len(children)  # outcomes of each dice at or before this result
+    counts = Distribution()
+    previous = 0
+    for result in results:
+        product = 1
+        for index, (child_counts, amount) in enumerate(children):
+            reached[index] += child_counts.get(result, 0)
+            product *= reached[index] ** amount
+        if product != previous:
+            counts[result] = product - previous
+        previous = product
+    return counts
 
 
 class AdvantageDices(DiceOfDices):
@@ -9,6 +42,23 @@ class AdvantageDices(DiceOfDices):
     def apply_logic(self, rolls: list[int]) -> int:
         return max(rolls)
 
+    def apply_logic_batch(self, rolls: np.ndarray) -> np.ndarray:
+        return rolls.max(axis=0)
+
+    def fold_start(self) -> Hashable:
+        return None
+
+    def fold_roll(self, state: Hashable, index: int, roll: int) -> Hashable:
+        return roll if state is None else max(cast(int, state), roll)
+
+    def fold_result(self, state: Hashable) -> int:
+        return cast(int, state)
+
+    def compute_distribution(self) -> Distribution:
+        if self.has_state():
+            return super().compute_distribution()
+        return extreme_distribution(self.dices, highest=True)
+
     def __str__(self) -> str:
         dices_str = ", ".join(str(dice) for dice in self.dices)
         return f"AdvantageDices([{dices_str}])"
@@ -24,13 +74,139 @@ class DisadvantageDices(DiceOfDices):
     def apply_logic(self, rolls: list[int]) -> int:
         return min(rolls)
 
+    def apply_logic_batch(self, rolls: np.ndarray) -> np.ndarray:
+        return rolls.min(axis=0)
+
+    def fold_start(self) -> Hashable:
+        return None
+
+    def fold_roll(self, state: Hashable, index: int, roll: int) -> Hashable:
+        return roll if state is None else min(cast(int, state), roll)
+
+    def fold_result(self, state: Hashable) -> int:
+        return cast(int, state)
+
+    def compute_distribution(self) -> Distribution:
+        if self.has_state():
+            return super().compute_distribution()
+        return extreme_distribution(self.dices, highest=False)
+
     def __str__(self) -> str:
         dices_str = ", ".join(str(dice) for dice in self.dices)
         return f"DisadvantageDices([{dices_str}])"
 
 
+class KeepHighestDices(DiceOfDices):
+    """Rolls every dice and adds up the keep highest rolls."""
+
+    def __init__(self, dices: list[BaseDice], keep: int) -> None:
+        if not 1 <= keep <= len(dices):
+            raise ValueError("keep must be between 1 and the number of dices")
+        super().__init__(dices)
+        self.keep = keep
+        self.max_side = sum(sorted(dice.max_side for dice in dices)[-keep:])
+
+    def apply_logic(self, rolls: list[int]) -> int:
+        return sum(sorted(rolls)[-self.keep :])
+
+    def apply_logic_batch(self, rolls: np.ndarray) -> np.ndarray:
+        return np.sort(rolls, axis=0)[-self.keep :].sum(axis=0)
+
+    # The fold remembers the smaller side of the pool: the highest rolls so far
+    # when few are kept, otherwise the running total and the lowest rolls so
+    # far, the ones that would be dropped. Either way the states stay few.
+
+    def fold_start(self) -> Hashable:
+        return (0, ())
+
+    def fold_roll(self, state: Hashable, index: int, roll: int) -> Hashable:
+        total, rolls = cast(tuple[int, tuple[int, ...]], state)
+        ordered = add_sorted(rolls, roll)
+        dropped = len(self.dices) - self.keep
+        if self.keep <= dropped:
+            return (0, ordered[-self.keep :])
+        return (total + roll, ordered[:dropped])
+
+    def fold_result(self, state: Hashable) -> int:
+        total, rolls = cast(tuple[int, tuple[int, ...]], state)
+        if self.keep <= len(self.dices) - self.keep:
+            return sum(rolls)
+        return total - sum(rolls)
+
+    def __str__(self) -> str:
+        dices_str = ", ".join(str(dice) for dice in self.dices)
+        return f"KeepHighestDices([{dices_str}], {self.keep})"
+
+
+class KeepLowestDices(DiceOfDices):
+    """Rolls every dice and adds up the keep lowest rolls."""
+
+    def __init__(self, dices: list[BaseDice], keep: int) -> None:
+        if not 1 <= keep <= len(dices):
+            raise ValueError("keep must be between 1 and the number of dices")
+        super().__init__(dices)
+        self.keep = keep
+        self.max_side = sum(sorted(dice.max_side for dice in dices)[:keep])
+
+    def apply_logic(self, rolls: list[int]) -> int:
+        return sum(sorted(rolls)[: self.keep])
+
+    def apply_logic_batch(self, rolls: np.ndarray) -> np.ndarray:
+        return np.sort(rolls, axis=0)[: self.keep].sum(axis=0)
+
+    # the same as KeepHighestDices, with the lowest and highest rolls swapped
+
+    def fold_start(self) -> Hashable:
+        return (0, ())
+
+    def fold_roll(self, state: Hashable, index: int, roll: int) -> Hashable:
+        total, rolls = cast(tuple[int, tuple[int, ...]], state)
+        ordered = add_sorted(rolls, roll)
+        dropped = len(self.dices) - self.keep
+        if self.keep <= dropped:
+            return (0, ordered[: self.keep])
+        return (total + roll, ordered[len(ordered) - dropped :])
+
+    def fold_result(self, state: Hashable) -> int:
+        total, rolls = cast(tuple[int, tuple[int, ...]], state)
+        if self.keep <= len(self.dices) - self.keep:
+            return sum(rolls)
+        return total - sum(rolls)
+
+    def __str__(self) -> str:
+        dices_str = ", ".join(str(dice) for dice in self.dices)
+        return f"KeepLowestDices([{dices_str}], {self.keep})"
+
+
+class DropLowestDices(KeepHighestDices):
+    """Rolls every dice and adds up all but the drop lowest rolls, like 4d6 drop lowest."""
+
+    def __init__(self, dices: list[BaseDice], drop: int = 1) -> None:
+        super().__init__(dices, len(dices) - drop)
+        self.drop = drop
+
+    def __str__(self) -> str:
+        dices_str = ", ".join(str(dice) for dice in self.dices)
+        return f"DropLowestDices([{dices_str}], {self.drop})"
+
+
+class DropHighestDices(KeepLowestDices):
+    """Rolls every dice and adds up all but the drop highest rolls."""
+
+    def __init__(self, dices: list[BaseDice], drop: int = 1) -> None:
+        super().__init__(dices, len(dices) - drop)
+        self.drop = drop
+
+    def __str__(self) -> str:
+        dices_str = ", ".join(str(dice) for dice in self.dices)
+        return f"DropHighestDices([{dices_str}], {self.drop})"
+
+
 class ComboDice(DiceOfDices):
-    """Warning: this dice can take a long time to roll, because it simulates 100 rolls always"""
+    """Rolls dice and keeps adding rolls until one stops the combo, at most combo_limit times.
+
+    Only the rolls the combo needs are made; the exact distribution still
+    counts the ones it skipped, as if all combo_limit had been rolled."""
     def __init__(
         self,
         dice: BaseDice,
@@ -51,6 +227,9 @@ class ComboDice(DiceOfDices):
         self.non_target = non_target
         self.max_side = dice.max_side
 
+    def _rolls_lazily(self) -> bool:
+        return not self.stateful and not self.dices_have_state()
+
     def _stop(self, roll: int) -> bool:
         if self.target:
             return roll not in self.target
@@ -58,6 +237,11 @@ class ComboDice(DiceOfDices):
             return roll in self.non_target
         return False
 
+    def _stops(self, rolls: np.ndarray) -> np.ndarray:
+        if self.target:
+            return ~np.isin(rolls, self.target)
+        return np.isin(rolls, self.non_target)
+
     def apply_logic(self, rolls: list[int]) -> int:
         total = 0
         for roll in rolls:
@@ -66,5 +250,59 @@ class ComboDice(DiceOfDices):
                 break
         return total
 
+    def apply_logic_batch(self, rolls: np.ndarray) -> np.ndarray:
+        stops = self._stops(rolls)
+        # a roll counts if no earlier roll of its combo stopped it
+        stopped_before = np.cumsum(stops, axis=0) - stops > 0
+        return np.where(stopped_before, 0, rolls).sum(axis=0)
+
+    def roll(self) -> int:
+        # dices with state move on every roll, so those still roll all of them
+        if not self._rolls_lazily():
+            return super().roll()
+        total = 0
+        for dice in self.dices:
+            roll = dice.roll()
+            total += roll
+            if self._stop(roll):
+                break
+        return total
+
+    def roll_batch(self, num_rolls: int) -> np.ndarray:
+        if not self._rolls_lazily() or not self.dices:
+            return super().roll_batch(num_rolls)
+        totals = self.dices[0].roll_batch(num_rolls)
+        going = np.flatnonzero(~self._stops(totals))
+        for dice in self.dices[1:]:
+            if not len(going):
+                break
+            rolls = dice.roll_batch(len(going))
+            totals[going] += rolls
+            going = going[~self._stops(rolls)]
+        return totals
+
+    def compute_distribution(self) -> Distribution:
+        # running holds the totals of the combos still going; each roll either
+        # stops them, and the rolls they skip still count their outcomes, or goes on
+        if self.has_state() or not self.dices:
+            return super().compute_distribution()
+        dice_counts = self.dices[0].get_distribution()
+        dice_total = sum(dice_counts.values())
+        stopping = Distribution(
+            {roll: count for roll, count in dice_counts.items() if self._stop(roll)}
+        )
+        going = Distribution(
+            {roll: count for roll, count in dice_counts.items() if not self._stop(roll)}
+        )
+        running = Distribution({0: 1})
+        counts = Distribution()
+        for index in range(len(self.dices)):
+            skipped = len(self.dices) - index - 1
+            stopped = running.convolve(stopping)
+            counts.merge(stopped.scaled(dice_total**skipped))
+            running = running.convolve(going)
+        counts.merge(running)
+        return counts
+
     def __str__(self) -> str:
         return f"ComboDice({self.dices[0]}, {self.target}, {self.non_target})"
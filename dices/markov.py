@@ -0,0 +1,272 @@
+import copy
+import warnings
+from collections.abc import Hashable
+from fractions import Fraction
+from typing import Any, cast
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse import linalg
+
+from dices.dice import BOOKKEEPING_ATTRIBUTES, BaseDice, Dice
+from dices.fairness import children_logic, state_nodes
+from dices.rng import DiceRng
+
+"""This module turns a dice with state into a Markov chain and studies it exactly.
+
+A state of the chain is the state of every stateful dice in the tree, taken
+together. From each state, one roll is enumerated exactly: which results it
+gives, and which state it leaves behind. The chain then answers what the
+n-th roll looks like and what the rolls settle to in the long run, with
+sparse linear algebra instead of simulated rolls. It needs SciPy, which the
+other modules don't, so dice.markov_chain only imports it when called."""
+
+MAX_STATES = 100_000  # states explored before giving up on a chain
+
+
+class _ScriptedChoice:
+    # stands in for random.Random, so the roll of a Dice picks the side we want
+    def __init__(self, index: int) -> None:
+        self.index = index
+
+    def choice(self, sides: list[int]) -> int:
+        return sides[self.index]
+
+
+class _ScriptedRng:
+    def __init__(self, index: int) -> None:
+        self.random = _ScriptedChoice(index)
+
+
+def _holds_dice(value: Any) -> bool:
+    if isinstance(value, BaseDice):
+        return True
+    return isinstance(value, list) and any(isinstance(item, BaseDice) for item in value)
+
+
+def _hashable(value: Any) -> Hashable:
+    if isinstance(value, list):
+        return tuple(_hashable(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, _hashable(item)) for key, item in value.items()))
+    return cast(Hashable, value)
+
+
+class _Explorer:
+    """Saves, restores and enumerates the states of one dice tree."""
+
+    def __init__(self, dice: BaseDice) -> None:
+        self.dice = dice
+        self.nodes = list(state_nodes(dice, {}).values())
+        self.saved: dict[Hashable, list[dict[str, Any]]] = {}
+
+    def snapshot(self) -> Hashable:
+        values = [
+            {
+                name: copy.deepcopy(value)
+                for name, value in vars(node).items()
+                if name not in BOOKKEEPING_ATTRIBUTES and not _holds_dice(value)
+            }
+            for node in self.nodes
+        ]
+        key = tuple(_hashable(node_values) for node_values in values)
+        self.saved.setdefault(key, values)
+        return key
+
+    def restore(self, key: Hashable) -> None:
+        for node, node_values in zip(self.nodes, self.saved[key]):
+            vars(node).update(copy.deepcopy(node_values))
+
+    def branches(
+        self, dice: BaseDice, key: Hashable
+    ) -> dict[tuple[int, Hashable], Fraction]:
+        """Probability of each (result, state after) of one roll of dice from state key.
+
+        The tree must be in state key when this is called."""
+        if not dice.has_state():
+            counts = dice.get_distribution()
+            total = sum(counts.values())
+            return {
+                (result, key): Fraction(count, total)
+                for result, count in counts.items()
+            }
+        if not dice.get_children() and isinstance(dice, Dice):
+            return self._leaf_branches(dice, key)
+        children, logic = children_logic(dice)
+        partial: dict[tuple[tuple[int, ...], Hashable], Fraction] = {
+            ((), key): Fraction(1)
+        }
+        for child in children:
+            new_partial: dict[tuple[tuple[int, ...], Hashable], Fraction] = {}
+            for (rolls, state), probability in partial.items():
+                self.restore(state)
+                for (roll, after), child_probability in self.branches(
+                    child, state
+                ).items():
+                    branch = (rolls + (roll,), after)
+                    new_partial[branch] = (
+                        new_partial.get(branch, Fraction(0))
+                        + probability * child_probability
+                    )
+            partial = new_partial
+        results: dict[tuple[int, Hashable], Fraction] = {}
+        for (rolls, state), probability in partial.items():
+            self.restore(state)
+            final_branch = (logic(list(rolls)), self.snapshot())
+            results[final_branch] = results.get(final_branch, Fraction(0)) + probability
+        return results
+
+    def _leaf_branches(
+        self, dice: Dice, key: Hashable
+    ) -> dict[tuple[int, Hashable], Fraction]:
+        # roll it once per side, each time telling it which side comes up
+        rng = dice.rng
+        sides_amount = max(len(dice.sides), 1)
+        results: dict[tuple[int, Hashable], Fraction] = {}
+        try:
+            for index in range(sides_amount):
+                self.restore(key)
+                dice.set_rng(cast(DiceRng, _ScriptedRng(index)))
+                result = dice.roll()
+                dice.set_rng(rng)
+                branch = (result, self.snapshot())
+                results[branch] = results.get(branch, Fraction(0)) + Fraction(
+                    1, sides_amount
+                )
+        except AttributeError:
+            raise ValueError(
+                f"{type(dice).__name__} uses more randomness than picking a side"
+            ) from None
+        finally:
+            dice.set_rng(rng)
+        return results
+
+
+class MarkovChain:
+    """The states a dice can be in, and how one roll moves between them.
+
+    transitions[i, j] is the probability that a roll from state i leaves the
+    dice in state j, and emissions[i, k] the probability that it gives
+    results[k]. State 0 is the state the dice was in when the chain was built.
+    A chain built for a number of rolls only knows the states those reach."""
+
+    def __init__(
+        self,
+        transitions: sparse.csr_matrix,
+        emissions: sparse.csr_matrix,
+        results: list[int],
+        rolls: int | None,
+    ) -> None:
+        self.transitions = transitions
+        self.emissions = emissions
+        self.results = results
+        self.rolls = rolls
+
+    def __len__(self) -> int:
+        return self.transitions.shape[0]
+
+    def _as_distribution(self, state_probabilities: np.ndarray) -> dict[int, float]:
+        probabilities = np.asarray(self.emissions.T @ state_probabilities)
+        return {
+            result: float(probability)
+            for result, probability in zip(self.results, probabilities)
+            if probability > 0
+        }
+
+    def state_distribution(self, rolls: int) -> np.ndarray:
+        """Probability of being in each state after rolls rolls."""
+        if self.rolls is not None and rolls > self.rolls:
+            raise ValueError(f"this chain only follows the first {self.rolls} rolls")
+        probabilities: np.ndarray = np.zeros(len(self))
+        probabilities[0] = 1.0
+        transposed = self.transitions.T.tocsr()
+        for _ in range(rolls):
+            probabilities = np.asarray(transposed @ probabilities)
+        return probabilities
+
+    def distribution_after(self, rolls: int) -> dict[int, float]:
+        """Probabilities of the results of roll number rolls, counting the next one as 1."""
+        if rolls < 1:
+            raise ValueError("rolls must be at least 1")
+        if self.rolls is not None and rolls > self.rolls:
+            raise ValueError(f"this chain only follows the first {self.rolls} rolls")
+        return self._as_distribution(self.state_distribution(rolls - 1))
+
+    def stationary_distribution(self) -> dict[int, float]:
+        """Probabilities of the results in the long run.
+
+        Solves pi = pi P with the probabilities summing to 1, which has a single
+        answer when every state leads to the same closed set of states."""
+        if self.rolls is not None:
+            raise ValueError("the chain was built for a number of rolls only")
+        size = len(self)
+        system = (self.transitions.T - sparse.identity(size, format="csr")).tolil()
+        system[size - 1, :] = np.ones(size)
+        target = np.zeros(size)
+        target[size - 1] = 1.0
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", linalg.MatrixRankWarning)
+            stationary = np.atleast_1d(linalg.spsolve(system.tocsc(), target))
+        if not np.all(np.isfinite(stationary)):
+            raise ValueError("the chain has more than one stationary distribution")
+        return self._as_distribution(np.clip(stationary, 0.0, None))
+
+    def __str__(self) -> str:
+        return f"MarkovChain({len(self)} states, {len(self.results)} results)"
+
+
+def build_chain(
+    dice: BaseDice, rolls: int | None = None, max_states: int = MAX_STATES
+) -> MarkovChain:
+    """Enumerate the states dice can reach, starting from the one it is in now.
+
+    With rolls, only the states reachable within that many rolls are followed,
+    which is enough for distribution_after up to rolls and works for dices
+    whose states never repeat, like AccumulatorSumDice. The dice is left in
+    the state it started in."""
+    explorer = _Explorer(dice)
+    start = explorer.snapshot()
+    states: dict[Hashable, int] = {start: 0}
+    depths = [0]
+    result_columns: dict[int, int] = {}
+    transitions: dict[tuple[int, int], Fraction] = {}
+    emissions: dict[tuple[int, int], Fraction] = {}
+    try:
+        queue = [start]
+        for index, state in enumerate(queue):
+            if rolls is not None and depths[index] >= rolls:
+                continue
+            explorer.restore(state)
+            for (result, after), probability in explorer.branches(dice, state).items():
+                if after not in states:
+                    if len(states) >= max_states:
+                        raise ValueError(
+                            f"{type(dice).__name__} has more than {max_states} states"
+                        )
+                    states[after] = len(queue)
+                    queue.append(after)
+                    depths.append(depths[index] + 1)
+                edge = (index, states[after])
+                transitions[edge] = transitions.get(edge, Fraction(0)) + probability
+                emission = (
+                    index,
+                    result_columns.setdefault(result, len(result_columns)),
+                )
+                emissions[emission] = emissions.get(emission, Fraction(0)) + probability
+    finally:
+        explorer.restore(start)
+    return MarkovChain(
+        _sparse(transitions, (len(states), len(states))),
+        _sparse(emissions, (len(states), len(result_columns))),
+        list(result_columns),
+        rolls,
+    )
+
+
+def _sparse(
+    entries: dict[tuple[int, int], Fraction], shape: tuple[int, int]
+) -> sparse.csr_matrix:
+    rows = [row for row, _ in entries]
+    columns = [column for _, column in entries]
+    values = [float(value) for value in entries.values()]
+    return sparse.csr_matrix((values, (rows, columns)), shape=shape)
@@ -1,4 +1,10 @@
-from dices.dice import BaseDice, BiDice, DiceOfDices
+from collections.abc import Hashable
+from math import gcd
+from typing import cast
+
+import numpy as np
+
+from dices.dice import BaseDice, BiDice, DiceOfDices, fits_int64
 
 """This module contains dice that apply various mathematical operations to the results of other dice."""
 
@@ -11,6 +17,18 @@ class SumDice(DiceOfDices):
     def apply_logic(self, rolls: list[int]) -> int:
         return sum(rolls)
 
+    def apply_logic_batch(self, rolls: np.ndarray) -> np.ndarray:
+        return rolls.sum(axis=0)
+
+    def fold_start(self) -> Hashable:
+        return 0
+
+    def fold_roll(self, state: Hashable, index: int, roll: int) -> Hashable:
+        return cast(int, state) + roll
+
+    def fold_result(self, state: Hashable) -> int:
+        return cast(int, state)
+
     def __str__(self) -> str:
         dice_str = ", ".join(str(die) for die in self.dices)
         return f"SumDice([{dice_str}])"
@@ -29,6 +47,23 @@ class MultiplicationDice(DiceOfDices):
             result *= roll
         return result
 
+    def apply_logic_batch(self, rolls: np.ndarray) -> np.ndarray:
+        bound = 1
+        for row_max in np.abs(rolls).max(axis=1, initial=0).tolist():
+            bound *= row_max
+        if not fits_int64(rolls, bound):
+            return super().apply_logic_batch(rolls)
+        return rolls.prod(axis=0)
+
+    def fold_start(self) -> Hashable:
+        return 1
+
+    def fold_roll(self, state: Hashable, index: int, roll: int) -> Hashable:
+        return cast(int, state) * roll
+
+    def fold_result(self, state: Hashable) -> int:
+        return cast(int, state)
+
     def __str__(self) -> str:
         dice_str = ", ".join(str(die) for die in self.dices)
         return f"MultiplicationDice([{dice_str}])"
@@ -39,11 +74,26 @@ class ExponentiationDice(BiDice):
 
     def __init__(self, base_die: BaseDice, exponent_die: BaseDice) -> None:
         super().__init__(base_die, exponent_die)
-        self.max_side = base_die.max_side**exponent_die.max_side
+
+    @property
+    def max_side(self) -> float:  # type: ignore[override]
+        # worked out only when asked, it can have millions of digits
+        return self.dice_a.max_side**self.dice_b.max_side
 
     def apply_logic(self, roll_a: int, roll_b: int) -> int:
         return roll_a**roll_b
 
+    def apply_logic_batch(self, rolls_a: np.ndarray, rolls_b: np.ndarray) -> np.ndarray:
+        if not fits_int64(rolls_a, 0) or not fits_int64(rolls_b, 0):
+            return super().apply_logic_batch(rolls_a, rolls_b)
+        if len(rolls_b) == 0 or rolls_b.min() < 0:
+            return super().apply_logic_batch(rolls_a, rolls_b)
+        base_max = int(np.abs(rolls_a).max())
+        exponent_max = int(rolls_b.max())
+        if base_max > 1 and (exponent_max >= 64 or base_max**exponent_max >= 2**63):
+            return super().apply_logic_batch(rolls_a, rolls_b)
+        return np.power(rolls_a, rolls_b)
+
     def __str__(self) -> str:
         return f"ExponentiationDice({self.dice_a}, {self.dice_b})"
 
@@ -56,6 +106,11 @@ class ModuloDice(BiDice):
     def apply_logic(self, roll_a: int, roll_b: int) -> int:
         return roll_a % roll_b
 
+    def apply_logic_batch(self, rolls_a: np.ndarray, rolls_b: np.ndarray) -> np.ndarray:
+        if (rolls_b == 0).any():
+            raise ZeroDivisionError("integer modulo by zero")
+        return np.mod(rolls_a, rolls_b)
+
     def __str__(self) -> str:
         return f"ModuloDice({self.dice_a}, {self.dice_b})"
 
@@ -68,6 +123,11 @@ class FloorDivisionDice(BiDice):
     def apply_logic(self, roll_a: int, roll_b: int) -> int:
         return roll_a // roll_b
 
+    def apply_logic_batch(self, rolls_a: np.ndarray, rolls_b: np.ndarray) -> np.ndarray:
+        if (rolls_b == 0).any():
+            raise ZeroDivisionError("integer division by zero")
+        return np.floor_divide(rolls_a, rolls_b)
+
     def __str__(self) -> str:
         return f"FloorDivisionDice({self.dice_a}, {self.dice_b})"
 
@@ -78,10 +138,22 @@ class GCDDice(DiceOfDices):
         self.max_side = min(die.max_side for die in self.dices)
 
     def apply_logic(self, rolls: list[int]) -> int:
-        from math import gcd
-
         return gcd(*rolls)
 
+    def apply_logic_batch(self, rolls: np.ndarray) -> np.ndarray:
+        if not fits_int64(rolls, 0):
+            return super().apply_logic_batch(rolls)
+        return np.gcd.reduce(rolls, axis=0)
+
+    def fold_start(self) -> Hashable:
+        return 0
+
+    def fold_roll(self, state: Hashable, index: int, roll: int) -> Hashable:
+        return gcd(cast(int, state), roll)
+
+    def fold_result(self, state: Hashable) -> int:
+        return cast(int, state)
+
     def __str__(self) -> str:
         dice_str = ", ".join(str(die) for die in self.dices)
         return f"GCDDice([{dice_str}])"
@@ -93,14 +165,34 @@ class LCMDice(DiceOfDices):
         self.max_side = max(die.max_side for die in self.dices)
 
     def apply_logic(self, rolls: list[int]) -> int:
-        from math import gcd
-
         total = 1
         for r in rolls:
             total *= r
         gcd_rolls = gcd(*rolls)
         return abs(total) // gcd_rolls
 
+    def apply_logic_batch(self, rolls: np.ndarray) -> np.ndarray:
+        bound = 1
+        for row_max in np.abs(rolls).max(axis=1, initial=0).tolist():
+            bound *= row_max
+        if not fits_int64(rolls, bound):
+            return super().apply_logic_batch(rolls)
+        gcd_rolls = np.gcd.reduce(rolls, axis=0)
+        if (gcd_rolls == 0).any():
+            raise ZeroDivisionError("integer division by zero")
+        return np.abs(rolls.prod(axis=0)) // gcd_rolls
+
+    def fold_start(self) -> Hashable:
+        return (1, 0)  # (product, gcd) of the rolls so far
+
+    def fold_roll(self, state: Hashable, index: int, roll: int) -> Hashable:
+        total, gcd_rolls = cast(tuple[int, int], state)
+        return (total * roll, gcd(gcd_rolls, roll))
+
+    def fold_result(self, state: Hashable) -> int:
+        total, gcd_rolls = cast(tuple[int, int], state)
+        return abs(total) // gcd_rolls
+
     def __str__(self) -> str:
         dice_str = ", ".join(str(die) for die in self.dices)
         return f"LCMDice([{dice_str}])"
@@ -116,6 +208,15 @@ class HipotenuseDice(BiDice):
 
         return int(sqrt(roll_a**2 + roll_b**2))
 
+    def apply_logic_batch(self, rolls_a: np.ndarray, rolls_b: np.ndarray) -> np.ndarray:
+        bound = (
+            int(np.abs(rolls_a).max(initial=0)) ** 2
+            + int(np.abs(rolls_b).max(initial=0)) ** 2
+        )
+        if not fits_int64(rolls_a, bound) or not fits_int64(rolls_b, bound):
+            return super().apply_logic_batch(rolls_a, rolls_b)
+        return np.sqrt(rolls_a**2 + rolls_b**2).astype(np.int64)
+
     def __str__(self) -> str:
         return f"HipotenuseDice({self.dice_a}, {self.dice_b})"
 
@@ -132,6 +233,15 @@ class CatetusDice(BiDice):
         known_side = roll_b
         return int(sqrt(abs(hipotenuse**2 - known_side**2)))
 
+    def apply_logic_batch(self, rolls_a: np.ndarray, rolls_b: np.ndarray) -> np.ndarray:
+        bound = (
+            int(np.abs(rolls_a).max(initial=0)) ** 2
+            + int(np.abs(rolls_b).max(initial=0)) ** 2
+        )
+        if not fits_int64(rolls_a, bound) or not fits_int64(rolls_b, bound):
+            return super().apply_logic_batch(rolls_a, rolls_b)
+        return np.sqrt(np.abs(rolls_a**2 - rolls_b**2)).astype(np.int64)
+
     def __str__(self) -> str:
         return f"CatetusDice({self.dice_a}, {self.dice_b})"
 
@@ -146,6 +256,10 @@ class ConcatenationDice(DiceOfDices):
         rolls_str.sort(reverse=True)
         return int("".join(rolls_str))
 
+    def fold_roll(self, state: Hashable, index: int, roll: int) -> Hashable:
+        # the order of the rolls doesn't matter, so keep them sorted to merge states
+        return tuple(sorted(cast(tuple[int, ...], state) + (roll,)))
+
     def __str__(self) -> str:
         dice_str = ", ".join(str(die) for die in self.dices)
         return f"ConcatenationDice([{dice_str}])"
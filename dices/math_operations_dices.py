@@ -1,7 +1,9 @@
 from math import exp, factorial, floor, isqrt, log
-from sympy import prime  # type: ignore
-from typing import cast
-from dices.dice import AlterDice, BaseDice, FunctionDice
+
+import numpy as np
+
+from dices.dice import AlterDice, BaseDice, FunctionDice, fits_int64
+from dices.primes import nth_prime, nth_primes
 
 """This module contains dice that have their behavior modified by mathematical operations."""
 
@@ -14,6 +16,11 @@ class ModDice(AlterDice):
     def apply_logic(self, roll: int) -> int:
         return roll % self.opperand[0] + 1
 
+    def apply_logic_batch(self, rolls: np.ndarray) -> np.ndarray:
+        if self.opperand[0] == 0:
+            raise ZeroDivisionError("integer modulo by zero")
+        return rolls % self.opperand[0] + 1
+
     def __str__(self) -> str:
         return f"ModDice({self.die}, {self.opperand})"
 
@@ -21,10 +28,13 @@ class ModDice(AlterDice):
 class PrimeDice(FunctionDice):
     def __init__(self, base_die: BaseDice) -> None:
         super().__init__(base_die)
-        self.max_side = cast(int, prime(base_die.max_side))
+        self.max_side = nth_prime(int(base_die.max_side))
 
     def apply_logic(self, roll: int) -> int:
-        return cast(int, prime(roll))
+        return nth_prime(roll)
+
+    def apply_logic_batch(self, rolls: np.ndarray) -> np.ndarray:
+        return nth_primes(rolls)
 
     def __str__(self) -> str:
         return f"PrimeDice({self.die})"
@@ -38,6 +48,9 @@ class OffsetDice(AlterDice):
     def apply_logic(self, roll: int) -> int:
         return roll + self.opperand[0]
 
+    def apply_logic_batch(self, rolls: np.ndarray) -> np.ndarray:
+        return rolls + self.opperand[0]
+
     def __str__(self) -> str:
         return f"OffsetDice({self.die}, {self.opperand[0]})"
 
@@ -50,6 +63,9 @@ class FloorDice(AlterDice):
     def apply_logic(self, roll: int) -> int:
         return max(roll, self.opperand[0])
 
+    def apply_logic_batch(self, rolls: np.ndarray) -> np.ndarray:
+        return np.maximum(rolls, self.opperand[0])
+
     def __str__(self) -> str:
         return f"FloorDice({self.die}, {self.opperand[0]})"
 
@@ -62,6 +78,9 @@ class CeilDice(AlterDice):
     def apply_logic(self, roll: int) -> int:
         return min(roll, self.opperand[0])
 
+    def apply_logic_batch(self, rolls: np.ndarray) -> np.ndarray:
+        return np.minimum(rolls, self.opperand[0])
+
     def __str__(self) -> str:
         return f"CeilDice({self.die}, {self.opperand[0]})"
 
@@ -74,6 +93,9 @@ class ClampDice(AlterDice):
     def apply_logic(self, roll: int) -> int:
         return max(self.opperand[0], min(roll, self.opperand[1]))
 
+    def apply_logic_batch(self, rolls: np.ndarray) -> np.ndarray:
+        return np.maximum(self.opperand[0], np.minimum(rolls, self.opperand[1]))
+
     def __str__(self) -> str:
         return f"ClampDice({self.die}, {self.opperand[0]}, {self.opperand[1]})"
 
@@ -86,6 +108,12 @@ class FactorDice(AlterDice):
     def apply_logic(self, roll: int) -> int:
         return roll * self.opperand[0]
 
+    def apply_logic_batch(self, rolls: np.ndarray) -> np.ndarray:
+        bound = int(np.abs(rolls).max(initial=0)) * abs(self.opperand[0])
+        if not fits_int64(rolls, bound):
+            return super().apply_logic_batch(rolls)
+        return rolls * self.opperand[0]
+
     def __str__(self) -> str:
         return f"FactorDice({self.die}, {self.opperand[0]})"
 
@@ -110,6 +138,14 @@ class PowerDice(AlterDice):
     def apply_logic(self, roll: int) -> int:
         return roll ** self.opperand[0]
 
+    def apply_logic_batch(self, rolls: np.ndarray) -> np.ndarray:
+        power = self.opperand[0]
+        if power < 0 or power >= 64 or not fits_int64(rolls, 0):
+            return super().apply_logic_batch(rolls)
+        if not fits_int64(rolls, int(np.abs(rolls).max(initial=0)) ** power):
+            return super().apply_logic_batch(rolls)
+        return rolls**power
+
     def __str__(self) -> str:
         return f"PowerDice({self.die}, {self.opperand[0]})"
 
@@ -158,6 +194,9 @@ class AbsDice(FunctionDice):
     def apply_logic(self, roll: int) -> int:
         return abs(roll)
 
+    def apply_logic_batch(self, rolls: np.ndarray) -> np.ndarray:
+        return np.abs(rolls)
+
     def __str__(self) -> str:
         return f"AbsDice({self.die})"
 
@@ -170,6 +209,9 @@ class NegDice(FunctionDice):
     def apply_logic(self, roll: int) -> int:
         return -roll
 
+    def apply_logic_batch(self, rolls: np.ndarray) -> np.ndarray:
+        return -rolls
+
     def __str__(self) -> str:
         return f"NegDice({self.die})"
 
@@ -184,5 +226,10 @@ class DivisionDice(AlterDice):
     def apply_logic(self, roll: int) -> int:
         return roll // self.opperand[0]
 
+    def apply_logic_batch(self, rolls: np.ndarray) -> np.ndarray:
+        if self.opperand[0] == 0:
+            raise ZeroDivisionError("integer division by zero")
+        return rolls // self.opperand[0]
+
     def __str__(self) -> str:
         return f"DivisionDice({self.die}, {self.opperand[0]})"
@@ -1,3 +1,7 @@
+import random
+
+import numpy as np
+
 from dices.dice import (
     AlterDice,
     BaseDice,
@@ -7,7 +11,6 @@ from dices.dice import (
     FunctionDice,
     OutcomesData,
 )
-import random
 
 
 class TheFutureDice(BaseDice):  # joke dice
@@ -18,6 +21,9 @@ class TheFutureDice(BaseDice):  # joke dice
     def roll(self) -> int:
         return 1  # always predict 1
 
+    def roll_batch(self, num_rolls: int) -> np.ndarray:
+        return np.ones(num_rolls, dtype=np.int64)
+
     def get_outcomes(self) -> OutcomesData:
         return [([1], 1)]
 
@@ -26,6 +32,8 @@ class TheFutureDice(BaseDice):  # joke dice
 
 
 class CarouselDice(DiceOfDices):
+    stateful = True
+
     def __init__(self, dices: list[BaseDice]) -> None:
         super().__init__(dices)
         self.index = 0
@@ -81,6 +89,18 @@ class BothAgreeDice(BiDice):
             else:
                 continue
 
+    def roll_batch(self, num_rolls: int) -> np.ndarray:
+        if self.has_state():
+            return super().roll_batch(num_rolls)
+        agreed: list[np.ndarray] = []
+        missing = num_rolls
+        while missing > 0:
+            rolls_a = self.dice_a.roll_batch(missing)
+            rolls_b = self.dice_b.roll_batch(missing)
+            agreed.append(rolls_a[rolls_a == rolls_b])
+            missing -= len(agreed[-1])
+        return np.concatenate(agreed) if agreed else np.zeros(0, dtype=np.int64)
+
     def __str__(self) -> str:
         return f"BothAgreeDice({self.dice_a}, {self.dice_b})"
 
@@ -97,6 +117,8 @@ class AlwaysMaxDice(FunctionDice):
 
 
 class RandomErrorDice(FunctionDice):  # joke dice LMAO
+    stateful = True  # not really a state, but every roll must go through the error check
+
     def __init__(self, die: BaseDice, error_rate: float) -> None:
         super().__init__(die)
         if not (0.0 <= error_rate <= 1.0):
@@ -104,7 +126,8 @@ class RandomErrorDice(FunctionDice):  # joke dice LMAO
         self.error_rate = error_rate
 
     def apply_logic(self, roll: int) -> int:
-        if random.random() < self.error_rate:
+        error_roll = random.random() if self.rng is None else self.rng.random.random()
+        if error_roll < self.error_rate:
             raise ValueError("Random error occurred during dice roll.")
         else:
             return roll
@@ -114,6 +137,8 @@ class RandomErrorDice(FunctionDice):  # joke dice LMAO
 
 
 class SurpriseDice(Dice):
+    stateful = True
+
     def __init__(self, sides_amount: int, min_value: int, max_value: int) -> None:
         self.sides_amount = sides_amount
         self.min_value = min_value
@@ -122,7 +147,8 @@ class SurpriseDice(Dice):
         super().__init__(self.sides)
 
     def change_sides(self) -> None:
-        sides = random.sample(
+        source = random if self.rng is None else self.rng.random
+        sides = source.sample(
             range(self.min_value, self.max_value + 1), self.sides_amount
         )
         self.sides = sides
@@ -248,7 +274,8 @@ class TalkativeDice(FunctionDice):
             "Roll me. Accept me.",
             "This outcome is between you and the universe.",
         ]
-        return random.choice(dialogues)
+        source = random if self.rng is None else self.rng.random
+        return source.choice(dialogues)
 
 
 class SleepDice(AlterDice):
@@ -263,6 +290,12 @@ class SleepDice(AlterDice):
         sleep(self.sleep_time)
         return roll
 
+    def apply_logic_batch(self, rolls: np.ndarray) -> np.ndarray:
+        from time import sleep
+
+        sleep(self.sleep_time * len(rolls))
+        return rolls
+
     def __str__(self) -> str:
         return f"SleepDice({self.die}, {self.sleep_time})"
 
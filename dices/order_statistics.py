@@ -0,0 +1,146 @@
+from functools import cache
+from typing import TYPE_CHECKING
+
+from dices.distribution import Distribution
+
+if TYPE_CHECKING:
+    from dices.dice import BaseDice
+
+"""This module contains the distributions of order statistics of independent dices.
+
+The k-th lowest roll, a pair of neighbouring ones, or the gap between the
+highest and the lowest, are all worked out from how many outcomes of each
+dice fall at or below each result (their CDFs), without going through the
+combinations of rolls. Counts are over every combination of outcomes of the
+dices, like the counts of a DiceOfDices."""
+
+
+def _children(dices: list["BaseDice"]) -> tuple[list[Distribution], list[int]]:
+    children = [dice.get_distribution() for dice in dices]
+    results = sorted(set().union(*children))
+    return children, results
+
+
+def _ways(below: list[int], above: list[int]) -> list[int]:
+    """ways[j]: combinations where exactly j dices land in below and the rest in above."""
+    ways = [1]
+    for below_count, above_count in zip(below, above):
+        new_ways = [0] * (len(ways) + 1)
+        for amount, way in enumerate(ways):
+            new_ways[amount] += way * above_count
+            new_ways[amount + 1] += way * below_count
+        ways = new_ways
+    return ways
+
+
+def kth_lowest_distribution(dices: list["BaseDice"], k: int) -> Distribution:
+    """Distribution of the k-th lowest roll (k = 1 is the lowest) of independent dices.
+
+    The k-th lowest is at most x when at least k rolls are, and the chance
+    of that follows from how many outcomes of each dice are at most x."""
+    if not 1 <= k <= len(dices):
+        raise ValueError("k must be between 1 and the number of dices")
+    children, results = _children(dices)
+    totals = [child.total() for child in children]
+    reached = [0] * len(children)
+    counts = Distribution()
+    previous = 0
+    for result in results:
+        for index, child in enumerate(children):
+            reached[index] += child.get(result, 0)
+        above = [total - count for total, count in zip(totals, reached)]
+        at_least_k = sum(_ways(reached, above)[k:])
+        if at_least_k != previous:
+            counts[result] = at_least_k - previous
+        previous = at_least_k
+    return counts
+
+
+def neighbours_distribution(
+    dices: list["BaseDice"], k: int
+) -> dict[tuple[int, int], int]:
+    """Joint counts of the k-th and (k+1)-th lowest rolls of independent dices.
+
+    For a < b, "the k-th is at most a and the next is at least b" means
+    exactly k rolls are at most a and the others at least b. Point counts
+    come from that by inclusion-exclusion, and ties are what is left of the
+    k-th lowest's own distribution."""
+    if not 1 <= k < len(dices):
+        raise ValueError("k must be between 1 and the number of dices minus 1")
+    children, results = _children(dices)
+    totals = [child.total() for child in children]
+    # at_most[i][j]: outcomes of dice i at most results[j - 1], so column 0 is empty
+    at_most = []
+    for child in children:
+        column = [0]
+        for result in results:
+            column.append(column[-1] + child.get(result, 0))
+        at_most.append(column)
+    size = len(results)
+
+    @cache
+    def both(low: int, high: int) -> int:
+        # k rolls at most results[low - 1] and the rest at least results[high]
+        if low == 0 or high >= size:
+            return 0
+        below = [column[low] for column in at_most]
+        above = [total - column[high] for total, column in zip(totals, at_most)]
+        return _ways(below, above)[k]
+
+    pairs: dict[tuple[int, int], int] = {}
+    apart: dict[int, int] = {}  # the k-th lowest is the key and the next one is higher
+    for low in range(1, size + 1):
+        for high in range(low, size):
+            count = (
+                both(low, high)
+                - both(low - 1, high)
+                - both(low, high + 1)
+                + both(low - 1, high + 1)
+            )
+            if count:
+                pairs[(results[low - 1], results[high])] = count
+                apart[results[low - 1]] = apart.get(results[low - 1], 0) + count
+    for result, count in kth_lowest_distribution(dices, k).items():
+        tie = count - apart.get(result, 0)
+        if tie:
+            pairs[(result, result)] = tie
+    return pairs
+
+
+def range_distribution(dices: list["BaseDice"]) -> Distribution:
+    """Distribution of the highest roll minus the lowest roll of independent dices.
+
+    Every roll lands between low and high in prod(outcomes of each dice in
+    [low, high]) ways, and inclusion-exclusion turns that into the counts of
+    lowest == low and highest == high at once."""
+    children, results = _children(dices)
+    at_most = []
+    for child in children:
+        column = [0]
+        for result in results:
+            column.append(column[-1] + child.get(result, 0))
+        at_most.append(column)
+    size = len(results)
+
+    def inside(low: int, high: int) -> int:
+        # every roll between results[low] and results[high]
+        if low > high or low >= size or high < 0:
+            return 0
+        product = 1
+        for column in at_most:
+            product *= column[high + 1] - column[low]
+        return product
+
+    counts = Distribution()
+    for low in range(size):
+        for high in range(low, size):
+            count = (
+                inside(low, high)
+                - inside(low + 1, high)
+                - inside(low, high - 1)
+                + inside(low + 1, high - 1)
+            )
+            if count:
+                gap = results[high] - results[low]
+                counts[gap] = counts.get(gap, 0) + count
+    return counts
@@ -0,0 +1,73 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from dices.dice import BaseDice
+from dices.distribution import Distribution
+from dices.rng import DiceRng
+from dices.streaming import count_rolls
+
+"""This module contains the process-pool Monte Carlo used by simulate_probabilities."""
+
+STREAMS = 64  # most random streams a simulation is split in
+MIN_CHUNK_SIZE = 100_000  # fewer rolls than this aren't worth a stream of their own
+
+
+def _count_chunks(
+    task: tuple[BaseDice, list[tuple[int, np.random.SeedSequence]]],
+) -> Distribution:
+    dice, chunks = task
+    counts = Distribution()
+    for num_rolls, seed_sequence in chunks:
+        dice.set_rng(DiceRng(seed_sequence))
+        counts.merge(count_rolls(dice, num_rolls))
+    return counts
+
+
+def simulate_counts(
+    dice: BaseDice,
+    num_rolls: int,
+    workers: int | None = None,
+    seed: int | None = None,
+    chunk_size: int | None = None,
+) -> Distribution:
+    """Roll the dice num_rolls times across a pool of processes and count each side.
+
+    The rolls are split in chunks, by default up to STREAMS of them, and every
+    chunk gets its own stream spawned from seed. The chunks only depend on
+    num_rolls, and each worker gets a share of them, so a given seed gives the
+    same counts no matter how many workers are used. Dice with state can't be
+    split, since every roll depends on the ones before it, so they are rolled
+    in this process, from a stream seeded with seed when there is one."""
+    if dice.has_state():
+        rng = dice.rng
+        if seed is not None:
+            dice.set_rng(DiceRng(seed))
+        try:
+            return count_rolls(dice, num_rolls)
+        finally:
+            if seed is not None:
+                dice.set_rng(rng)
+    if chunk_size is None:
+        chunk_size = max(-(-num_rolls // STREAMS), MIN_CHUNK_SIZE)
+    sizes = [chunk_size] * (num_rolls // chunk_size)
+    if num_rolls % chunk_size:
+        sizes.append(num_rolls % chunk_size)
+    chunks = list(zip(sizes, np.random.SeedSequence(seed).spawn(len(sizes))))
+    workers = min(workers or os.cpu_count() or 1, max(len(chunks), 1))
+    # consecutive chunks go to the same worker, one share per worker
+    tasks = [
+        (
+            dice,
+            chunks[
+                len(chunks) * worker // workers : len(chunks) * (worker + 1) // workers
+            ],
+        )
+        for worker in range(workers)
+    ]
+    counts = Distribution()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for task_counts in pool.map(_count_chunks, tasks):
+            counts.merge(task_counts)
+    return counts
@@ -0,0 +1,58 @@
+from math import isqrt, log
+
+import numpy as np
+
+"""This module contains the table of primes PrimeDice looks its results up in.
+
+The primes are sieved the first time an index needs them, and the table at
+least doubles whenever a larger index comes, so looking up the n-th prime is
+an index into a list, or into an array for a whole batch of rolls. Indexes
+beyond MAX_TABLE go to sympy instead of growing the table that far."""
+
+MAX_TABLE = 5_000_000  # most primes kept in the table, about 40 MB as int64
+
+_primes = np.array([2, 3, 5, 7, 11, 13], dtype=np.int64)
+_prime_list: list[int] = _primes.tolist()
+
+
+def _sieve(limit: int) -> np.ndarray:
+    # every prime below limit
+    is_prime = np.ones(limit, dtype=bool)
+    is_prime[:2] = False
+    for number in range(2, isqrt(limit - 1) + 1):
+        if is_prime[number]:
+            is_prime[number * number :: number] = False
+    return np.flatnonzero(is_prime).astype(np.int64)
+
+
+def _grow(count: int) -> None:
+    global _primes, _prime_list
+    if count <= len(_primes):
+        return
+    count = min(max(count, 2 * len(_primes)), MAX_TABLE)
+    # the n-th prime is below n (ln n + ln ln n) for n >= 6
+    _primes = _sieve(int(count * (log(count) + log(log(count)))) + 1)
+    _prime_list = _primes.tolist()
+
+
+def nth_prime(index: int) -> int:
+    """The index-th prime, counting 2 as the first, like sympy.prime."""
+    if type(index) is int and 0 < index <= len(_prime_list):
+        return _prime_list[index - 1]
+    if not isinstance(index, (int, np.integer)) or not 0 < index <= MAX_TABLE:
+        from sympy import prime  # type: ignore
+
+        return int(prime(index))  # raises for the indexes sympy refuses too
+    _grow(int(index))
+    return _prime_list[index - 1]
+
+
+def nth_primes(indexes: np.ndarray) -> np.ndarray:
+    """nth_prime of every index in an array."""
+    if not len(indexes):
+        return np.zeros(0, dtype=np.int64)
+    lowest, highest = indexes.min(), indexes.max()
+    if indexes.dtype.kind not in "iu" or lowest < 1 or highest > MAX_TABLE:
+        return np.array([nth_prime(index) for index in indexes.tolist()])
+    _grow(int(highest))
+    return _primes[indexes - 1]
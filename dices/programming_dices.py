@@ -1,4 +1,11 @@
+from collections.abc import Hashable
+from math import prod
+from typing import cast
+
+import numpy as np
+
 from dices.dice import BaseDice, BiDice, DiceOfDices, FunctionDice
+from dices.distribution import Distribution
 
 
 class AndDice(DiceOfDices):
@@ -9,6 +16,18 @@ class AndDice(DiceOfDices):
     def apply_logic(self, rolls: list[int]) -> int:
         return int(all(rolls))
 
+    def apply_logic_batch(self, rolls: np.ndarray) -> np.ndarray:
+        return (rolls != 0).all(axis=0).astype(np.int64)
+
+    def fold_start(self) -> Hashable:
+        return True
+
+    def fold_roll(self, state: Hashable, index: int, roll: int) -> Hashable:
+        return cast(bool, state) and roll != 0
+
+    def fold_result(self, state: Hashable) -> int:
+        return int(cast(bool, state))
+
     def __str__(self) -> str:
         dice_str = ", ".join(str(die) for die in self.dices)
         return f"AndDice([{dice_str}])"
@@ -22,6 +41,18 @@ class OrDice(DiceOfDices):
     def apply_logic(self, rolls: list[int]) -> int:
         return int(any(rolls))
 
+    def apply_logic_batch(self, rolls: np.ndarray) -> np.ndarray:
+        return (rolls != 0).any(axis=0).astype(np.int64)
+
+    def fold_start(self) -> Hashable:
+        return False
+
+    def fold_roll(self, state: Hashable, index: int, roll: int) -> Hashable:
+        return cast(bool, state) or roll != 0
+
+    def fold_result(self, state: Hashable) -> int:
+        return int(cast(bool, state))
+
     def __str__(self) -> str:
         dice_str = ", ".join(str(die) for die in self.dices)
         return f"OrDice([{dice_str}])"
@@ -35,6 +66,9 @@ class NotDice(FunctionDice):
     def apply_logic(self, roll: int) -> int:
         return 1 if roll == 0 else 0
 
+    def apply_logic_batch(self, rolls: np.ndarray) -> np.ndarray:
+        return (rolls == 0).astype(np.int64)
+
     def __str__(self) -> str:
         return f"NotDice({self.die})"
 
@@ -47,6 +81,9 @@ class XorDice(BiDice):
     def apply_logic(self, roll_a: int, roll_b: int) -> int:
         return int((roll_a != 0) ^ (roll_b != 0))
 
+    def apply_logic_batch(self, rolls_a: np.ndarray, rolls_b: np.ndarray) -> np.ndarray:
+        return ((rolls_a != 0) ^ (rolls_b != 0)).astype(np.int64)
+
     def __str__(self) -> str:
         return f"XorDice({self.dice_a}, {self.dice_b})"
 
@@ -59,6 +96,9 @@ class EqualDice(BiDice):
     def apply_logic(self, roll_a: int, roll_b: int) -> int:
         return int(roll_a == roll_b)
 
+    def apply_logic_batch(self, rolls_a: np.ndarray, rolls_b: np.ndarray) -> np.ndarray:
+        return (rolls_a == rolls_b).astype(np.int64)
+
     def __str__(self) -> str:
         return f"EqualDice({self.dice_a}, {self.dice_b})"
 
@@ -71,6 +111,9 @@ class NotEqualDice(BiDice):
     def apply_logic(self, roll_a: int, roll_b: int) -> int:
         return int(roll_a != roll_b)
 
+    def apply_logic_batch(self, rolls_a: np.ndarray, rolls_b: np.ndarray) -> np.ndarray:
+        return (rolls_a != rolls_b).astype(np.int64)
+
     def __str__(self) -> str:
         return f"NotEqualDice({self.dice_a}, {self.dice_b})"
 
@@ -83,6 +126,9 @@ class GreaterThanDice(BiDice):
     def apply_logic(self, roll_a: int, roll_b: int) -> int:
         return int(roll_a > roll_b)
 
+    def apply_logic_batch(self, rolls_a: np.ndarray, rolls_b: np.ndarray) -> np.ndarray:
+        return (rolls_a > rolls_b).astype(np.int64)
+
     def __str__(self) -> str:
         return f"GreaterThanDice({self.dice_a}, {self.dice_b})"
 
@@ -95,6 +141,9 @@ class LessThanDice(BiDice):
     def apply_logic(self, roll_a: int, roll_b: int) -> int:
         return int(roll_a < roll_b)
 
+    def apply_logic_batch(self, rolls_a: np.ndarray, rolls_b: np.ndarray) -> np.ndarray:
+        return (rolls_a < rolls_b).astype(np.int64)
+
     def __str__(self) -> str:
         return f"LessThanDice({self.dice_a}, {self.dice_b})"
 
@@ -115,6 +164,70 @@ class RoutingDice(DiceOfDices):
         selected_dice_roll = rolls[decision]
         return selected_dice_roll
 
+    def apply_logic_batch(self, rolls: np.ndarray) -> np.ndarray:
+        decisions = rolls[0]
+        if ((decisions >= len(rolls)) | (decisions < -len(rolls))).any():
+            raise IndexError("list index out of range")
+        # negative decisions index from the end, like they do in apply_logic
+        return rolls[decisions % len(rolls), np.arange(rolls.shape[1])]
+
+    def _rolls_picked_only(self) -> bool:
+        return not self.stateful and not self.dices_have_state()
+
+    def roll(self) -> int:
+        # only the dice the decision picks is rolled
+        if not self._rolls_picked_only():
+            return super().roll()
+        decision = self.dices[0].roll()
+        selected = self.dices[decision]
+        if decision % len(self.dices) == 0:
+            return decision  # index 0 is the decision roll itself
+        return selected.roll()
+
+    def roll_batch(self, num_rolls: int) -> np.ndarray:
+        if not self._rolls_picked_only():
+            return super().roll_batch(num_rolls)
+        decisions = self.dices[0].roll_batch(num_rolls)
+        if ((decisions >= len(self.dices)) | (decisions < -len(self.dices))).any():
+            raise IndexError("list index out of range")
+        picked = decisions % len(self.dices)
+        results = decisions.copy()
+        for index in range(1, len(self.dices)):
+            chosen = picked == index
+            amount = int(chosen.sum())
+            if amount:
+                rolls = self.dices[index].roll_batch(amount)
+                if rolls.dtype == object:
+                    results = results.astype(object)
+                results[chosen] = rolls
+        return results
+
+    def compute_distribution(self) -> Distribution:
+        # a mixture of the dices the decision picks, weighted by the decision
+        # counts; the dices not picked still count their outcomes, like in the fold
+        if self.has_state():
+            return super().compute_distribution()
+        decision_counts = self.dices[0].get_distribution()
+        if any(
+            not -len(self.dices) <= decision < len(self.dices)
+            for decision in decision_counts
+        ):
+            return super().compute_distribution()
+        totals = [sum(dice.get_distribution().values()) for dice in self.dices[1:]]
+        counts = Distribution()
+        if not prod(totals):
+            return counts  # a dice without outcomes leaves no combinations
+        for decision, decision_count in decision_counts.items():
+            index = decision % len(self.dices)
+            if index == 0:
+                factor = decision_count * prod(totals)
+                counts[decision] = counts.get(decision, 0) + factor
+                continue
+            factor = decision_count * prod(totals[: index - 1] + totals[index:])
+            for result, count in self.dices[index].get_distribution().items():
+                counts[result] = counts.get(result, 0) + count * factor
+        return counts
+
     def __str__(self) -> str:
         dices_explain = ", ".join(str(dice) for dice in self.dices[1:])
         return f"RoutingDice({self.dices[0]}, [{dices_explain}])"
@@ -130,6 +243,34 @@ class ForLoopDice(DiceOfDices):
         total = sum(rolls[1 : iterations + 1])
         return total
 
+    def apply_logic_batch(self, rolls: np.ndarray) -> np.ndarray:
+        iterations = rolls[0]
+        if (iterations < 0).any():
+            return super().apply_logic_batch(rolls)
+        loop_index = np.arange(1, len(rolls))[:, np.newaxis]
+        return np.where(loop_index <= iterations, rolls[1:], 0).sum(axis=0)
+
+    def compute_distribution(self) -> Distribution:
+        # a mixture over the iterations rolled of the sums of that many base rolls;
+        # the base dices left out still count their outcomes, like in the fold
+        if self.has_state():
+            return super().compute_distribution()
+        iterations_counts = self.dices[0].get_distribution()
+        base_counts = self.dices[1].get_distribution()
+        base_total = base_counts.total()
+        loop_length = len(self.dices) - 1
+        sums = [Distribution({0: 1})]
+        for _ in range(loop_length):
+            sums.append(sums[-1].convolve(base_counts))
+        counts = Distribution()
+        for iterations, iterations_count in iterations_counts.items():
+            # the same slice apply_logic takes, negative iterations included
+            used = len(range(len(self.dices))[1 : iterations + 1])
+            factor = iterations_count * base_total ** (loop_length - used)
+            for result, count in sums[used].items():
+                counts[result] = counts.get(result, 0) + count * factor
+        return counts
+
     def __str__(self) -> str:
         return f"ForLoopDice({self.dices[1]}, {self.dices[0]})"
 
@@ -157,5 +298,35 @@ class WhileLoopDice(DiceOfDices):
             total += base_roll
         return total
 
+    def apply_logic_batch(self, rolls: np.ndarray) -> np.ndarray:
+        condition_rolls = rolls[: self.loop_limit]
+        base_rolls = rolls[self.loop_limit :]
+        # a base roll counts if the target wasn't hit on or before its iteration
+        stopped = np.cumsum(condition_rolls == self.target, axis=0) > 0
+        return np.where(stopped, 0, base_rolls).sum(axis=0)
+
+    def compute_distribution(self) -> Distribution:
+        # running holds the sums of the loops still going, and every iteration
+        # the condition either hits the target and stops them or adds a base roll
+        if self.has_state():
+            return super().compute_distribution()
+        condition_counts = self.dices[0].get_distribution()
+        base_counts = self.dices[self.loop_limit].get_distribution()
+        hits = condition_counts.get(self.target, 0)
+        misses = condition_counts.total() - hits
+        iteration_total = condition_counts.total() * base_counts.total()
+        running = Distribution({0: 1})
+        counts = Distribution()
+        for iteration in range(self.loop_limit):
+            # the base roll of this iteration and all later ones roll for nothing
+            left = self.loop_limit - iteration - 1
+            factor = hits * base_counts.total() * iteration_total**left
+            if factor:
+                for result, count in running.items():
+                    counts[result] = counts.get(result, 0) + count * factor
+            running = running.scaled(misses).convolve(base_counts)
+        counts.merge(running)
+        return Distribution({result: count for result, count in counts.items() if count})
+
     def __str__(self) -> str:
         return f"WhileLoopDice({self.dices[self.loop_limit]}, {self.dices[0]}, {self.target})"
@@ -0,0 +1,38 @@
+import random
+
+import numpy as np
+
+"""This module contains the random streams that can be given to a dice tree."""
+
+
+class DiceRng:
+    """Random streams for one dice tree, built from a single seed.
+
+    roll_batch draws from a NumPy generator and roll from a random.Random
+    seeded by it, so both paths replay exactly for the same seed. Child
+    streams from spawn never overlap, which is what lets a big simulation
+    be split in shards and replayed shard by shard."""
+
+    def __init__(self, seed: int | np.random.SeedSequence | None = None) -> None:
+        if isinstance(seed, np.random.SeedSequence):
+            self.seed_sequence = seed
+        else:
+            self.seed_sequence = np.random.SeedSequence(seed)
+        self.generator = np.random.default_rng(self.seed_sequence)
+        self.random = random.Random(int(self.generator.integers(2**63)))
+
+    def spawn(self, amount: int) -> list["DiceRng"]:
+        """Independent child streams, the same ones every time for the same seed."""
+        return [DiceRng(sequence) for sequence in self.seed_sequence.spawn(amount)]
+
+    def jumped(self, jumps: int = 1) -> "DiceRng":
+        """A copy of this stream advanced as if 2**127 numbers had been drawn per jump."""
+        jumped_rng = DiceRng(self.seed_sequence)
+        bit_generator = self.generator.bit_generator
+        if isinstance(bit_generator, np.random.PCG64):
+            jumped_rng.generator = np.random.Generator(bit_generator.jumped(jumps))
+            jumped_rng.random = random.Random(int(jumped_rng.generator.integers(2**63)))
+        return jumped_rng
+
+    def __str__(self) -> str:
+        return f"DiceRng({self.seed_sequence.entropy})"
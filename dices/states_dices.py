@@ -1,8 +1,11 @@
 from typing import cast
+
 from dices.dice import AlterDice, BaseDice, Dice, FunctionDice
 
 
 class RemoveItemDice(Dice):
+    stateful = True
+
     def __init__(self, sides: list[int]) -> None:
         super().__init__(sides)
         self.original_sides = sides.copy()
@@ -26,6 +29,8 @@ class RemoveItemDice(Dice):
 
 
 class AddItemDice(Dice):
+    stateful = True
+
     def __init__(self, sides: list[int]) -> None:
         super().__init__(sides)
         self.original_sides = sides.copy()
@@ -43,6 +48,8 @@ class AddItemDice(Dice):
 
 
 class AccumulatorSumDice(FunctionDice):
+    stateful = True
+
     def __init__(self, die: BaseDice) -> None:
         super().__init__(die)
         self._accumulated_sum = 0
@@ -59,6 +66,8 @@ class AccumulatorSumDice(FunctionDice):
 
 
 class AccumulatorProductDice(FunctionDice):
+    stateful = True
+
     def __init__(self, die: BaseDice) -> None:
         super().__init__(die)
         self._accumulated_product = 1
@@ -75,6 +84,8 @@ class AccumulatorProductDice(FunctionDice):
 
 
 class MaxStateDice(FunctionDice):
+    stateful = True
+
     def __init__(self, die: BaseDice) -> None:
         super().__init__(die)
         self.max_roll = float("-inf")
@@ -92,6 +103,8 @@ class MaxStateDice(FunctionDice):
 
 
 class MinStateDice(FunctionDice):
+    stateful = True
+
     def __init__(self, die: BaseDice) -> None:
         super().__init__(die)
         self.min_roll = float("inf")
@@ -109,6 +122,8 @@ class MinStateDice(FunctionDice):
 
 
 class CountOccurrencesDice(FunctionDice):
+    stateful = True
+
     def __init__(self, die: BaseDice) -> None:
         super().__init__(die)
         self.occurrences: dict[int, int] = {}
@@ -128,6 +143,8 @@ class CountOccurrencesDice(FunctionDice):
 
 
 class AverageStateDice(FunctionDice):
+    stateful = True
+
     def __init__(self, die: BaseDice) -> None:
         super().__init__(die)
         self.total = 0
@@ -147,6 +164,8 @@ class AverageStateDice(FunctionDice):
 
 
 class ThePastDice(AlterDice):
+    stateful = True
+
     def __init__(self, die: BaseDice, n: int) -> None:
         super().__init__(die, [n])
         self.past_rolls: list[int] = []
@@ -169,6 +188,8 @@ class ThePastDice(AlterDice):
 
 class WaitDice(AlterDice):
     # test if a fixed time has passed to get used
+    stateful = True
+
     def __init__(self, die: BaseDice, wait_time: int) -> None:
         super().__init__(die, [wait_time])
         from datetime import datetime
@@ -194,6 +215,8 @@ class WaitDice(AlterDice):
 
 
 class LimitUsesDice(AlterDice):
+    stateful = True
+
     def __init__(self, die: BaseDice, max_uses: int) -> None:
         super().__init__(die, [max_uses])
         self.uses_left = max_uses
@@ -1,5 +1,25 @@
+from collections.abc import Hashable
 from math import sqrt
+from typing import cast
+
+import numpy as np
+
 from dices.dice import BaseDice, DiceOfDices
+from dices.distribution import Distribution
+from dices.order_statistics import (
+    kth_lowest_distribution,
+    neighbours_distribution,
+    range_distribution,
+)
+
+
+def _variance_batch(rolls: np.ndarray) -> np.ndarray:
+    # same order of float operations as VarianceDice.apply_logic, so results match
+    mean = rolls.sum(axis=0) / len(rolls)
+    total = np.zeros(rolls.shape[1])
+    for row in rolls:
+        total = total + (row - mean) ** 2
+    return total / len(rolls)
 
 
 class MeanDice(DiceOfDices):
@@ -10,12 +30,26 @@ class MeanDice(DiceOfDices):
     def apply_logic(self, rolls: list[int]) -> int:
         return sum(rolls) // len(rolls)
 
+    def apply_logic_batch(self, rolls: np.ndarray) -> np.ndarray:
+        return rolls.sum(axis=0) // len(rolls)
+
+    def fold_start(self) -> Hashable:
+        return 0
+
+    def fold_roll(self, state: Hashable, index: int, roll: int) -> Hashable:
+        return cast(int, state) + roll
+
+    def fold_result(self, state: Hashable) -> int:
+        return cast(int, state) // len(self.dices)
+
     def __str__(self) -> str:
         dice_str = ", ".join(str(die) for die in self.dices)
         return f"MeanDice([{dice_str}])"
 
 
 class MedianDice(DiceOfDices):
+    order_matters = False
+
     def __init__(self, dice_list: list[BaseDice]) -> None:
         super().__init__(dice_list)
         self.max_side = sorted(die.max_side for die in dice_list)[len(dice_list) // 2]
@@ -29,6 +63,27 @@ class MedianDice(DiceOfDices):
         else:
             return rolls[mid]
 
+    def apply_logic_batch(self, rolls: np.ndarray) -> np.ndarray:
+        rolls = np.sort(rolls, axis=0)
+        n = len(rolls)
+        mid = n // 2
+        if n % 2 == 0:
+            return (rolls[mid - 1] + rolls[mid]) // 2
+        else:
+            return rolls[mid]
+
+    def compute_distribution(self) -> Distribution:
+        if self.has_state():
+            return super().compute_distribution()
+        mid = len(self.dices) // 2
+        if len(self.dices) % 2 == 1:
+            return kth_lowest_distribution(self.dices, mid + 1)
+        counts = Distribution()
+        for (low, high), count in neighbours_distribution(self.dices, mid).items():
+            result = (low + high) // 2
+            counts[result] = counts.get(result, 0) + count
+        return counts
+
     def __str__(self) -> str:
         dice_str = ", ".join(str(die) for die in self.dices)
         return f"MedianDice([{dice_str}])"
@@ -52,6 +107,8 @@ class ModeDice(DiceOfDices):
 
 
 class VarianceDice(DiceOfDices):
+    order_matters = False
+
     def __init__(self, dice_list: list[BaseDice]) -> None:
         super().__init__(dice_list)
         self.max_side = max(die.max_side for die in dice_list)
@@ -61,12 +118,17 @@ class VarianceDice(DiceOfDices):
         variance = sum((x - mean) ** 2 for x in rolls) / len(rolls)
         return int(variance)
 
+    def apply_logic_batch(self, rolls: np.ndarray) -> np.ndarray:
+        return _variance_batch(rolls).astype(np.int64)
+
     def __str__(self) -> str:
         dice_str = ", ".join(str(die) for die in self.dices)
         return f"VarianceDice([{dice_str}])"
 
 
 class StdDevDice(DiceOfDices):
+    order_matters = False
+
     def __init__(self, dice_list: list[BaseDice]) -> None:
         super().__init__(dice_list)
         self.max_side = max(die.max_side for die in dice_list)
@@ -77,6 +139,9 @@ class StdDevDice(DiceOfDices):
         stddev = sqrt(variance)
         return int(stddev)
 
+    def apply_logic_batch(self, rolls: np.ndarray) -> np.ndarray:
+        return np.sqrt(_variance_batch(rolls)).astype(np.int64)
+
     def __str__(self) -> str:
         dice_str = ", ".join(str(die) for die in self.dices)
         return f"StdDevDice([{dice_str}])"
@@ -89,6 +154,27 @@ class RangeDice(DiceOfDices):
     def apply_logic(self, rolls: list[int]) -> int:
         return max(rolls) - min(rolls)
 
+    def apply_logic_batch(self, rolls: np.ndarray) -> np.ndarray:
+        return rolls.max(axis=0) - rolls.min(axis=0)
+
+    def fold_start(self) -> Hashable:
+        return None
+
+    def fold_roll(self, state: Hashable, index: int, roll: int) -> Hashable:
+        if state is None:
+            return (roll, roll)
+        low, high = cast(tuple[int, int], state)
+        return (min(low, roll), max(high, roll))
+
+    def fold_result(self, state: Hashable) -> int:
+        low, high = cast(tuple[int, int], state)
+        return high - low
+
+    def compute_distribution(self) -> Distribution:
+        if self.has_state():
+            return super().compute_distribution()
+        return range_distribution(self.dices)
+
     def __str__(self) -> str:
         dice_str = ", ".join(str(die) for die in self.dices)
         return f"RangeDice([{dice_str}])"
@@ -115,6 +201,14 @@ class WeightedMeanDice(DiceOfDices):
         total_weight = sum(weight_rolls)
         return sum(weighted_rolls) // total_weight if total_weight != 0 else 0
 
+    def apply_logic_batch(self, rolls: np.ndarray) -> np.ndarray:
+        dice_rolls = rolls[: self.dice_amount]
+        weight_rolls = rolls[self.dice_amount :]
+        weighted_total = (dice_rolls * weight_rolls).sum(axis=0)
+        total_weight = weight_rolls.sum(axis=0)
+        safe_weight = np.where(total_weight != 0, total_weight, 1)
+        return np.where(total_weight != 0, weighted_total // safe_weight, 0)
+
     def __str__(self) -> str:
         dice_str = ", ".join(str(die) for die in self.dices[: self.dice_amount])
         weights_str = ", ".join(
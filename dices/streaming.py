@@ -0,0 +1,166 @@
+from math import log, sqrt
+from statistics import NormalDist
+
+import numpy as np
+
+from dices.dice import BaseDice
+from dices.distribution import Distribution
+
+"""This module contains streaming simulations, which count rolls as they are drawn
+instead of keeping them, and can stop once the estimate is precise enough.
+
+simulate_until checks its bound after every batch and stops the first time
+it is small enough. A bound built for a single check would hold less often
+than its confidence says, so the error allowed, 1 - confidence, is spent
+across the checks: check k gets (1 - confidence) / (k (k + 1)), and those add
+up to 1 - confidence however many checks there are."""
+
+BATCH_SIZE = 100_000  # rolls drawn per step, the only rolls held in memory
+
+
+def add_rolls(counts: dict[int, int], rolls: np.ndarray) -> None:
+    """Add a batch of rolls to the histogram in counts, in place."""
+    if len(rolls) and rolls.dtype != object:
+        low = int(rolls.min())
+        if int(rolls.max()) - low < len(rolls):
+            # few possible sides compared to the rolls: count them as a dense array
+            batch = Distribution.from_array(low, np.bincount(rolls - low))
+            for side, count in batch.items():
+                counts[side] = counts.get(side, 0) + count
+            return
+    sides, sides_counts = np.unique(rolls, return_counts=True)
+    for side, count in zip(sides.tolist(), sides_counts.tolist()):
+        counts[side] = counts.get(side, 0) + count
+
+
+def count_rolls(
+    dice: BaseDice, num_rolls: int, batch_size: int = BATCH_SIZE
+) -> Distribution:
+    """Roll the dice num_rolls times and count each side, one batch at a time."""
+    counts = Distribution()
+    remaining = num_rolls
+    while remaining > 0:
+        batch = min(batch_size, remaining)
+        add_rolls(counts, dice.roll_batch(batch))
+        remaining -= batch
+    return counts
+
+
+def side_bound(
+    counts: dict[int, int], num_rolls: int, confidence: float, sides: int | None = None
+) -> float:
+    """Largest distance from a side's frequency to the ends of its Wilson interval.
+
+    The Wilson interval is not centred on the frequency, so the distance is
+    taken to whichever end is further. The confidence is split between the
+    sides (Bonferroni): all of them when sides is known, else the ones seen so
+    far. Sides not seen yet have a frequency of 0 and are bounded too."""
+    seen = len(counts)
+    alpha = (1 - confidence) / max(seen, sides or 0, 1)
+    z = NormalDist().inv_cdf(1 - alpha / 2)
+    denominator = 1 + z * z / num_rolls
+    frequencies = [count / num_rolls for count in counts.values()]
+    if sides is not None and sides > seen:
+        frequencies.append(0.0)
+    largest = 0.0
+    for p in frequencies:
+        centre = (p + z * z / (2 * num_rolls)) / denominator
+        spread = p * (1 - p) / num_rolls + z * z / (4 * num_rolls * num_rolls)
+        half_width = z * sqrt(spread) / denominator
+        largest = max(largest, abs(centre - p) + half_width)
+    return largest
+
+
+def total_variation_bound(
+    counts: dict[int, int], num_rolls: int, confidence: float, sides: int | None = None
+) -> float:
+    """Bound on the total variation distance between the estimate and the dice.
+
+    The expected distance is at most sqrt(k / n) / 2 for k sides, and by
+    McDiarmid's inequality it exceeds that by more than sqrt(ln(1 / alpha) / 2n)
+    with probability alpha at most. k is sides when it is known, else the
+    number of sides seen so far."""
+    expected = sqrt(max(len(counts), sides or 0) / num_rolls) / 2
+    return expected + sqrt(log(1 / (1 - confidence)) / (2 * num_rolls))
+
+
+def known_sides(dice: BaseDice) -> int | None:
+    """How many different results the dice has, if that is known without rolling.
+
+    Only leaves (dices without dices of their own) know it for free."""
+    if dice.get_children() or dice.has_state():
+        return None
+    return len(dice.get_distribution())
+
+
+BOUNDS = {"side": side_bound, "total_variation": total_variation_bound}
+
+
+def check_confidence(confidence: float, check: int) -> float:
+    """Confidence of the bound at check number check, counting from 1.
+
+    Check k may miss with probability (1 - confidence) / (k (k + 1)), so all
+    the checks together miss with probability 1 - confidence at most."""
+    return 1 - (1 - confidence) / (check * (check + 1))
+
+
+class SimulationReport:
+    """Result of simulate_until: the estimate and how it was reached."""
+
+    def __init__(
+        self, counts: Distribution, rolls_used: int, bound: float, converged: bool
+    ) -> None:
+        self.counts = counts
+        self.rolls_used = rolls_used
+        self.bound = bound
+        self.converged = converged
+
+    @property
+    def probabilities(self) -> dict[int, float]:
+        return self.counts.to_floats()
+
+    def __str__(self) -> str:
+        state = "converged" if self.converged else "stopped at max_rolls"
+        return f"SimulationReport({self.rolls_used} rolls, bound {self.bound:.6f}, {state})"
+
+
+def simulate_until(
+    dice: BaseDice,
+    precision: float,
+    bound: str = "side",
+    confidence: float = 0.95,
+    batch_size: int = BATCH_SIZE,
+    max_rolls: int = 10**9,
+    sides: int | None = None,
+) -> SimulationReport:
+    """Roll the dice in batches until the chosen confidence bound is below precision.
+
+    bound is "side" (every side's probability within precision) or
+    "total_variation" (the whole distribution within precision). The bound
+    holds with the given confidence at whichever batch the rolls stop, see
+    check_confidence. sides is how many different results the dice has, when
+    the caller knows it; otherwise it is worked out for leaves, and the other
+    dices count the sides seen so far."""
+    if bound not in BOUNDS:
+        raise ValueError(f"bound must be one of {sorted(BOUNDS)}")
+    if not 0.0 < confidence < 1.0:
+        raise ValueError("confidence must be between 0.0 and 1.0")
+    compute_bound = BOUNDS[bound]
+    if sides is None:
+        sides = known_sides(dice)
+    counts = Distribution()
+    rolls_used = 0
+    current_bound = float("inf")
+    checks = 0
+    while rolls_used < max_rolls:
+        # grow the batches geometrically, so stopping overshoots by 2x at most
+        batch = min(batch_size, max(1000, rolls_used), max_rolls - rolls_used)
+        add_rolls(counts, dice.roll_batch(batch))
+        rolls_used += batch
+        checks += 1
+        current_bound = compute_bound(
+            counts, rolls_used, check_confidence(confidence, checks), sides
+        )
+        if current_bound <= precision:
+            return SimulationReport(counts, rolls_used, current_bound, True)
+    return SimulationReport(counts, rolls_used, current_bound, False)
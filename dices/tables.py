@@ -0,0 +1,173 @@
+import copy
+import os
+import sys
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from dices.catalog import CATALOG_DIR
+from dices.rng import DiceRng
+
+if TYPE_CHECKING:
+    from dices.dice import BaseDice
+
+"""This module contains precomputed sampling tables for a list of dice.
+
+write_tables saves the exact distribution of every dice together with an
+alias table, and SamplerTables maps that file back, so rolling any of them is
+two random numbers and a lookup, without building the dice or importing the
+modules they come from. Dices with state are saved with how often each result
+comes up over the rolls it takes their state to come back, which is what
+rolling them many times gives. Build the table for the from_1_to_100 catalog
+with `python -m dices.tables`."""
+
+MAGIC = int.from_bytes(b"DICETAB1", "little")
+VERSION = 1
+HEADER_SIZE = 4  # magic, version, number of dices, number of entries
+CATALOG_TABLES = os.path.join(CATALOG_DIR, "dices_from_1_to_100.tables")
+
+_rng = np.random.default_rng()
+
+
+def alias_table(weights: list[int]) -> tuple[list[int], list[int]]:
+    """Vose's alias method with integer weights, so the table is exact.
+
+    Pick a bin uniformly and a number uniformly below sum(weights): below the
+    bin's threshold the bin's own side wins, otherwise its alias does."""
+    total = sum(weights)
+    amount = len(weights)
+    scaled = [weight * amount for weight in weights]
+    thresholds = [total] * amount
+    aliases = list(range(amount))
+    small = [index for index, weight in enumerate(scaled) if weight < total]
+    large = [index for index, weight in enumerate(scaled) if weight >= total]
+    while small and large:
+        less = small.pop()
+        more = large.pop()
+        thresholds[less] = scaled[less]
+        aliases[less] = more
+        scaled[more] -= total - scaled[less]
+        if scaled[more] < total:
+            small.append(more)
+        else:
+            large.append(more)
+    return thresholds, aliases
+
+
+def alias_draw(
+    generator: np.random.Generator,
+    thresholds: np.ndarray,
+    aliases: np.ndarray,
+    total: int,
+    num_rolls: int,
+) -> np.ndarray:
+    """Indexes of num_rolls sides drawn from an alias table."""
+    bins = generator.integers(0, len(thresholds), num_rolls)
+    picks = generator.integers(0, total, num_rolls)
+    return np.where(picks < thresholds[bins], bins, aliases[bins])
+
+
+def write_tables(dices: list["BaseDice"], path: str) -> None:
+    """Save the exact distribution and alias table of every dice, in list order.
+
+    Dices with state are followed roll by roll (see dices.fairness) on a copy
+    of them, so neither they nor the dices they share with others change."""
+    from dices.fairness import cycle_distribution
+
+    index: list[tuple[int, int, int]] = []
+    values: list[int] = []
+    weights: list[int] = []
+    thresholds: list[int] = []
+    aliases: list[int] = []
+    for dice in dices:
+        if dice.has_state():
+            counts = cycle_distribution(copy.deepcopy(dice))
+        else:
+            counts = dice.get_distribution()
+        sides = sorted(counts)
+        dice_weights = [counts[side] for side in sides]
+        total = sum(dice_weights)
+        if total * len(sides) >= 2**63:
+            raise ValueError(f"{dice} has too many outcomes for a sampling table")
+        dice_thresholds, dice_aliases = alias_table(dice_weights)
+        index.append((len(values), len(sides), total))
+        values.extend(sides)
+        weights.extend(dice_weights)
+        thresholds.extend(dice_thresholds)
+        aliases.extend(dice_aliases)
+    header = [MAGIC, VERSION, len(dices), len(values)]
+    data = header + [number for entry in index for number in entry]
+    data += values + weights + thresholds + aliases
+    np.array(data, dtype="<i8").tofile(path)
+
+
+class SamplerTables:
+    """Read-only view of a file written by write_tables.
+
+    The file is memory-mapped, so processes that open the same file share its
+    pages; pickling only sends the path, and the other process maps it again."""
+
+    def __init__(self, path: str = CATALOG_TABLES) -> None:
+        self.path = path
+        data = np.memmap(path, dtype="<i8", mode="r")
+        if len(data) < HEADER_SIZE or data[0] != MAGIC or data[1] != VERSION:
+            raise ValueError(f"{path} is not a sampling table file")
+        amount, entries = int(data[2]), int(data[3])
+        start = HEADER_SIZE + 3 * amount
+        self.index = data[HEADER_SIZE:start].reshape(amount, 3)
+        self.values = data[start : start + entries]
+        self.weights = data[start + entries : start + 2 * entries]
+        self.thresholds = data[start + 2 * entries : start + 3 * entries]
+        self.aliases = data[start + 3 * entries : start + 4 * entries]
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __reduce__(self) -> tuple[type, tuple[str]]:
+        return (SamplerTables, (self.path,))
+
+    def _entry(self, dice: int) -> tuple[int, int, int]:
+        offset, size, total = (int(number) for number in self.index[dice])
+        if size == 0:
+            raise ValueError(f"dice {dice} has no sides to roll")
+        return offset, size, total
+
+    def get_distribution(self, dice: int) -> dict[int, int]:
+        offset, size, _ = (int(number) for number in self.index[dice])
+        values = self.values[offset : offset + size].tolist()
+        weights = self.weights[offset : offset + size].tolist()
+        return dict(zip(values, weights))
+
+    def get_probabilities(self, dice: int) -> dict[int, float]:
+        counts = self.get_distribution(dice)
+        total = sum(counts.values())
+        return {side: count / total for side, count in counts.items()}
+
+    def roll_batch(
+        self, dice: int, num_rolls: int, rng: DiceRng | None = None
+    ) -> np.ndarray:
+        offset, size, total = self._entry(dice)
+        generator = rng.generator if rng is not None else _rng
+        thresholds = self.thresholds[offset : offset + size]
+        aliases = self.aliases[offset : offset + size]
+        chosen = alias_draw(generator, thresholds, aliases, total, num_rolls)
+        return np.asarray(self.values[offset : offset + size][chosen])
+
+    def roll(self, dice: int, rng: DiceRng | None = None) -> int:
+        return int(self.roll_batch(dice, 1, rng)[0])
+
+    def __str__(self) -> str:
+        return f"SamplerTables({self.path!r})"
+
+
+def main() -> None:
+    from dices.catalog import load_catalog
+
+    path = sys.argv[1] if len(sys.argv) > 1 else CATALOG_TABLES
+    all_dices = load_catalog()
+    write_tables(all_dices, path)
+    print(f"Wrote {len(all_dices)} dices to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+import pytest
+
+from dices.composed_dice import DuoDice, MultiDice
+from dices.dice import AlterDice, BaseDice, Dice, SequentialDice
+from dices.gaming_dices import AdvantageDices, ComboDice, DisadvantageDices
+from dices.math_dices import (
+    ExponentiationDice,
+    FloorDivisionDice,
+    GCDDice,
+    HipotenuseDice,
+    MultiplicationDice,
+    SumDice,
+)
+from dices.math_operations_dices import (
+    AbsDice,
+    ClampDice,
+    DivisionDice,
+    FactorialDice,
+    LogDice,
+    ModDice,
+    NegDice,
+    PrimeDice,
+)
+from dices.programming_dices import (
+    AndDice,
+    ForLoopDice,
+    GreaterThanDice,
+    NotDice,
+    OrDice,
+    WhileLoopDice,
+)
+from dices.rng import DiceRng
+from dices.statistical_dices import MeanDice, MedianDice, RangeDice, StdDevDice
+
+ROLLS = 200_000
+dice_4 = SequentialDice(4)
+dice_6 = SequentialDice(6)
+dice_8 = SequentialDice(8)
+dice_20 = SequentialDice(20)
+
+
+def batch_frequencies(dice: BaseDice, seed: int) -> dict[int, float]:
+    dice.set_rng(DiceRng(seed))
+    try:
+        rolls = dice.roll_batch(ROLLS).tolist()
+    finally:
+        dice.set_rng(None)
+    assert len(rolls) == ROLLS
+    frequencies: dict[int, float] = {}
+    for roll in rolls:
+        frequencies[roll] = frequencies.get(roll, 0) + 1 / ROLLS
+    return frequencies
+
+
+def assert_close(dice: BaseDice, seed: int) -> None:
+    exact = dice.get_probabilities()
+    frequencies = batch_frequencies(dice, seed)
+    assert set(frequencies) <= set(exact), dice
+    for side, probability in exact.items():
+        # about five standard deviations of a frequency over ROLLS rolls
+        tolerance = 5 * (probability * (1 - probability) / ROLLS) ** 0.5 + 1e-9
+        assert abs(frequencies.get(side, 0.0) - probability) <= tolerance, (dice, side)
+
+
+def test_roll_batch_follows_the_exact_distribution() -> None:
+    dices: list[BaseDice] = [
+        Dice([1, 2, 2, 3, 3, 3]),
+        SumDice([dice_6, dice_8]),
+        MultiplicationDice([dice_4, dice_6]),
+        ExponentiationDice(dice_4, SequentialDice(3)),
+        FloorDivisionDice(dice_20, dice_6),
+        GCDDice([dice_6, dice_8]),
+        HipotenuseDice(dice_6, dice_8),
+        ModDice(dice_20, 7),
+        ClampDice(dice_20, 5, 15),
+        LogDice(dice_20, 2),
+        FactorialDice(dice_4),
+        PrimeDice(dice_20),
+        AbsDice(Dice([-3, -1, 0, 2])),
+        NegDice(dice_6),
+        AdvantageDices([dice_20, dice_20]),
+        DisadvantageDices([dice_6, dice_8, dice_4]),
+        MeanDice([dice_6, dice_8]),
+        MedianDice([dice_6, dice_8, dice_4]),
+        StdDevDice([dice_4, dice_6]),
+        RangeDice([dice_6, dice_6, dice_6]),
+        AndDice([dice_4, Dice([0, 1])]),
+        OrDice([Dice([0, 1]), Dice([0, 0, 1])]),
+        NotDice(Dice([0, 1, 2])),
+        GreaterThanDice(dice_8, dice_6),
+        MultiDice([dice_4, dice_6]),
+        DuoDice(dice_6, dice_4),
+        ForLoopDice(dice_6, dice_4),
+        WhileLoopDice(dice_6, dice_4, 4, loop_limit=3),
+        ComboDice(dice_4, [4]),
+        ComboDice(dice_6, non_target=[1, 2], combo_limit=3),
+    ]
+    for seed, dice in enumerate(dices):
+        assert_close(dice, seed)
+
+
+def test_roll_batch_handles_results_past_int64() -> None:
+    dice = ExponentiationDice(Dice([10]), Dice([30]))
+    assert dice.roll_batch(3).tolist() == [10**30] * 3
+
+
+def test_roll_batch_raises_on_zero_divisors_like_roll() -> None:
+    dices: list[AlterDice] = [DivisionDice(dice_6, 2), ModDice(dice_6, 2)]
+    for dice in dices:
+        dice.opperand = [0]
+        with pytest.raises(ZeroDivisionError):
+            dice.roll()
+        with pytest.raises(ZeroDivisionError):
+            dice.roll_batch(10)
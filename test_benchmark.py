@@ -0,0 +1,47 @@
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+import benchmark
+from dices.dice import BaseDice, Dice, SequentialDice
+from dices.math_dices import SumDice
+from dices.states_dices import AccumulatorSumDice, RemoveItemDice
+
+
+def test_benchmark_writes_its_report_where_asked(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    cases: dict[str, list[BaseDice]] = {
+        "math_dices": [SumDice([SequentialDice(6)] * 2)],
+        "states_dices": [RemoveItemDice([1, 2, 3])],
+    }
+    monkeypatch.setattr(benchmark, "build_cases", lambda: cases)
+    monkeypatch.setattr(benchmark, "ROLLS", 200)
+    output = tmp_path / "report.json"
+    monkeypatch.setattr(sys, "argv", ["benchmark.py", "--output", str(output)])
+    benchmark.main()
+    report = json.loads(output.read_text())
+    assert set(report) == {"math_dices", "states_dices"}
+    results = report["math_dices"]["00 SumDice"]
+    assert results["roll_per_second"] > 0
+    assert results["get_probabilities_peak_bytes"] > 0
+
+
+def test_benchmark_report_stays_out_of_the_repo() -> None:
+    repo = os.path.dirname(os.path.abspath(benchmark.__file__))
+    assert not os.path.abspath(benchmark.DEFAULT_OUTPUT).startswith(repo + os.sep)
+
+
+def test_every_measure_starts_from_the_same_state(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    dice = AccumulatorSumDice(Dice([5]))
+    first_rolls: list[int] = []
+    benchmark.best_time(dice, lambda fresh: first_rolls.append(fresh.roll()))
+    assert first_rolls == [5, 5, 5]
+    monkeypatch.setattr(benchmark, "ROLLS", 100)
+    benchmark.measure(dice)
+    assert dice.roll() == 5  # the dice itself was never rolled
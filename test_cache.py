@@ -0,0 +1,45 @@
+from dices.cache import DistributionCache, distribution_cache
+from dices.dice import SequentialDice
+from dices.distribution import Distribution
+from dices.math_dices import SumDice
+from dices.states_dices import AccumulatorSumDice
+
+
+def test_equal_dices_share_a_cache_entry() -> None:
+    distribution_cache.clear()
+    first = SumDice([SequentialDice(6), SequentialDice(8)])
+    second = SumDice([SequentialDice(6), SequentialDice(8)])
+    counts = first.get_distribution()
+    misses = distribution_cache.misses
+    assert second.get_distribution() == counts
+    assert distribution_cache.misses == misses
+    assert distribution_cache.hits >= 1
+
+
+def test_cached_counts_are_not_changed_by_callers() -> None:
+    distribution_cache.clear()
+    dice = SumDice([SequentialDice(4), SequentialDice(4)])
+    counts = dice.get_distribution()
+    counts[2] = 100
+    assert dice.get_distribution()[2] == 1
+
+
+def test_dices_with_state_are_not_cached() -> None:
+    distribution_cache.clear()
+    AccumulatorSumDice(SequentialDice(4)).get_distribution()
+    keys = distribution_cache.info()["size"]
+    # only the stateless SequentialDice inside may be stored
+    assert keys <= 1
+
+
+def test_least_recently_used_entries_are_evicted() -> None:
+    cache = DistributionCache(maxsize=2)
+    cache.put("a", Distribution({1: 1}))
+    cache.put("b", Distribution({2: 1}))
+    assert cache.get("a") == {1: 1}
+    cache.put("c", Distribution({3: 1}))
+    assert cache.get("b") is None
+    assert cache.get("a") == {1: 1}
+    cache.resize(0)
+    cache.put("d", Distribution({4: 1}))
+    assert cache.info()["size"] == 0
@@ -0,0 +1,47 @@
+from conftest import CountedDice, enumerated
+from dices.dice import BaseDice, Dice, SequentialDice
+from dices.gaming_dices import ComboDice
+from dices.math_dices import SumDice
+from dices.states_dices import RemoveItemDice
+
+dice_4 = SequentialDice(4)
+dice_6 = SequentialDice(6)
+dice_weird = Dice([0, 0, 5, 5, 10])
+
+
+def test_combos_match_enumeration() -> None:
+    dices: list[BaseDice] = [
+        ComboDice(dice_4, [4]),
+        ComboDice(dice_6, [5, 6], combo_limit=3),
+        ComboDice(dice_weird, non_target=[0], combo_limit=4),
+        ComboDice(SumDice([dice_4, dice_4]), [8], combo_limit=2),
+    ]
+    for dice in dices:
+        assert dice.get_distribution() == enumerated(dice), dice
+
+
+def test_combos_only_roll_until_they_stop() -> None:
+    counted = CountedDice([1, 2])
+    dice = ComboDice(counted, non_target=[1, 2], combo_limit=5)
+    for _ in range(10):
+        dice.roll()
+    assert counted.rolls == 10
+    keeps_going = CountedDice([3])
+    ComboDice(keeps_going, [3], combo_limit=5).roll()
+    assert keeps_going.rolls == 5
+
+
+def test_combos_roll_every_dice_once_one_has_state() -> None:
+    counted = CountedDice([3])
+    dice = ComboDice(counted, non_target=[3], combo_limit=4)
+    dice.roll()
+    assert counted.rolls == 1
+    # a dice with state put in later has to move on with every roll again
+    remover = RemoveItemDice([3] * 10)
+    dice.dices[1] = remover
+    dice.roll()
+    assert counted.rolls == 4 and len(remover.sides) == 9
+    removers: list[BaseDice] = [remover] * 4
+    dice.dices = removers
+    dice.roll()
+    assert len(remover.sides) == 5
@@ -0,0 +1,41 @@
+from dices.dice import BaseDice, Dice, SequentialDice
+from dices.math_dices import SumDice
+
+
+def pairwise(dice: BaseDice, other: BaseDice) -> tuple[int, int, int]:
+    """Wins of dice, wins of other and ties, over every pair of outcomes."""
+    wins, losses, ties = 0, 0, 0
+    for _, result in dice.get_outcomes():
+        for _, other_result in other.get_outcomes():
+            wins += result > other_result
+            losses += result < other_result
+            ties += result == other_result
+    return wins, losses, ties
+
+
+def test_compare_dice_counts_every_pair() -> None:
+    pairs = [
+        (Dice([2, 4, 9]), Dice([1, 6, 8])),
+        (Dice([1, 6, 8]), Dice([3, 5, 7])),
+        (SequentialDice(6), SequentialDice(6)),
+        (SumDice([SequentialDice(4), SequentialDice(4)]), SequentialDice(8)),
+        (Dice([0, 0, 5, 5, 10]), Dice([-1, 5, 20])),
+        (Dice([1, 1, 3, 3]), Dice([2, 2, 2, 4, 4, 4])),
+    ]
+    for dice, other in pairs:
+        comparision = dice.compare_dice(other)
+        wins, losses, ties = pairwise(dice, other)
+        assert comparision["self_win"] == wins
+        assert comparision["other_win"] == losses
+        assert comparision["tie"] == ties
+        assert comparision["total"] == wins - losses
+
+
+def test_intransitive_dices() -> None:
+    dice_a = Dice([2, 4, 9])
+    dice_b = Dice([1, 6, 8])
+    dice_c = Dice([3, 5, 7])
+    assert dice_a > dice_b
+    assert dice_b > dice_c
+    assert dice_c > dice_a
+    assert SequentialDice(6) == Dice([1, 2, 3, 4, 5, 6])
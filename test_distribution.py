@@ -0,0 +1,63 @@
+from fractions import Fraction
+
+import numpy as np
+
+from dices.dice import Dice, SequentialDice
+from dices.distribution import Distribution
+from dices.math_dices import SumDice
+
+
+def test_normalized_keeps_the_probabilities_with_the_smallest_counts() -> None:
+    counts = Distribution({1: 4, 2: 6, 3: 10})
+    assert counts.normalized() == {1: 2, 2: 3, 3: 5}
+    assert counts.normalized().same_as(counts)
+    assert Distribution({1: 1, 2: 3}).normalized() == {1: 1, 2: 3}
+
+
+def test_same_as_compares_probabilities_across_scales() -> None:
+    counts = SumDice([SequentialDice(6), SequentialDice(6)]).get_distribution()
+    doubled = counts.scaled(2)
+    assert doubled != counts
+    assert doubled.same_as(counts)
+    repeated = Dice([1, 1, 2, 2]).get_distribution()
+    assert repeated.same_as(SequentialDice(2).get_distribution())
+    assert not counts.same_as({**counts, 2: counts[2] + 1})
+    assert not counts.same_as({**counts, 13: 1})
+
+
+def test_probabilities_are_exact() -> None:
+    counts = Distribution({0: 1, 1: 2})
+    assert counts.probability(1) == Fraction(2, 3)
+    assert counts.probabilities() == {0: Fraction(1, 3), 1: Fraction(2, 3)}
+    # one float per result, rounded once from the exact fraction
+    assert counts.to_floats()[0] == 1 / 3
+
+
+def test_convolve_adds_every_pair_of_results() -> None:
+    dense = Distribution({1: 1, 2: 2, 3: 1})
+    sparse = Distribution({0: 3, 100: 1})
+    for first, second in ((dense, dense), (dense, sparse), (sparse, sparse)):
+        expected: dict[int, int] = {}
+        for result, count in first.items():
+            for other_result, other_count in second.items():
+                total = result + other_result
+                expected[total] = expected.get(total, 0) + count * other_count
+        assert first.convolve(second) == expected
+    huge = Distribution({1: 2**70, 2: 1})
+    assert huge.convolve(huge)[2] == 2**140
+
+
+def test_arrays_round_trip() -> None:
+    counts = Distribution({-2: 3, 0: 1, 1: 5})
+    low, array = counts.to_array()
+    assert low == -2
+    assert array.tolist() == [3, 0, 1, 5]
+    assert Distribution.from_array(low, array) == counts
+    assert Distribution.from_array(0, np.zeros(3, dtype=np.int64)) == {}
+
+
+def test_merge_pools_counts() -> None:
+    counts = Distribution({1: 1})
+    counts.merge({1: 2, 5: 1})
+    assert counts == {1: 3, 5: 1}
+    assert counts.total() == 4
@@ -0,0 +1,53 @@
+from conftest import enumerated
+from dices.composed_dice import DuoDice, MultiDice
+from dices.dice import BaseDice, Dice, SequentialDice
+from dices.math_dices import (
+    CatetusDice,
+    ConcatenationDice,
+    ExponentiationDice,
+    GCDDice,
+    HipotenuseDice,
+    LCMDice,
+    MultiplicationDice,
+    SumDice,
+)
+from dices.math_operations_dices import ClampDice, ModDice, OffsetDice
+from dices.programming_dices import AndDice, GreaterThanDice, XorDice
+from dices.statistical_dices import MeanDice, ModeDice, StdDevDice, VarianceDice
+
+dice_4 = SequentialDice(4)
+dice_6 = SequentialDice(6)
+dice_8 = SequentialDice(8)
+dice_weird = Dice([0, 0, 5, 5, 10])
+
+
+def test_folded_counts_match_enumeration() -> None:
+    dices: list[BaseDice] = [
+        SumDice([dice_6, dice_8, dice_weird]),
+        MultiplicationDice([dice_4, dice_6, dice_4]),
+        GCDDice([dice_6, dice_8, dice_8]),
+        LCMDice([dice_4, dice_6]),
+        ConcatenationDice([dice_4, dice_weird]),
+        MeanDice([dice_4, dice_6, dice_8]),
+        ModeDice([dice_4, dice_4, dice_6]),
+        VarianceDice([dice_4, dice_6]),
+        StdDevDice([dice_4, dice_6]),
+        AndDice([dice_6, Dice([0, 1])]),
+        MultiDice([dice_4, dice_6]),
+        ExponentiationDice(dice_4, SequentialDice(3)),
+        HipotenuseDice(dice_6, dice_8),
+        CatetusDice(dice_8, dice_6),
+        XorDice(dice_6, dice_4),
+        GreaterThanDice(dice_weird, dice_6),
+        DuoDice(dice_6, dice_4),
+        ModDice(SumDice([dice_6, dice_6]), 4),
+        ClampDice(OffsetDice(MultiplicationDice([dice_4, dice_6]), 2), 3, 9),
+    ]
+    for dice in dices:
+        assert dice.get_distribution() == enumerated(dice), dice
+
+
+def test_nested_trees_match_enumeration() -> None:
+    inner = SumDice([dice_4, dice_weird])
+    dice = MultiplicationDice([inner, GCDDice([inner, dice_6])])
+    assert dice.get_distribution() == enumerated(dice)
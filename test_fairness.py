@@ -0,0 +1,50 @@
+import copy
+from fractions import Fraction
+
+from dices.catalog import load_catalog
+from dices.composed_dice import OneExtraSideDice
+from dices.dice import Dice, SequentialDice
+from dices.fairness import (
+    cycle_distribution,
+    cycle_rolls,
+    roll_distribution,
+    verify_dice,
+)
+
+
+def test_dices_without_state_are_checked_once() -> None:
+    report = verify_dice(SequentialDice(6), 6)
+    assert report.is_fair()
+    assert report.rounds == 1
+    assert report.roll_deviation == report.cycle_deviation == 0
+    unfair = verify_dice(Dice([1, 1, 2]), 2)
+    assert not unfair.is_fair()
+    assert unfair.cycle_deviation == Fraction(1, 6)
+
+
+def test_one_extra_side_is_fair_over_its_rounds() -> None:
+    dice = OneExtraSideDice(SequentialDice(6))
+    first_roll = roll_distribution(copy.deepcopy(dice))
+    # half of the first rolls are 1, the other half a d6 moved up by one
+    assert first_roll.probability(1) == Fraction(1, 2)
+    assert first_roll.probability(7) == Fraction(1, 12)
+    report = verify_dice(dice, 7)
+    assert report.is_fair()
+    assert report.rounds == 7
+    assert report.roll_deviation == Fraction(1, 2) - Fraction(1, 7)
+
+
+def test_following_the_rolls_leaves_the_state_where_it_was() -> None:
+    dice = OneExtraSideDice(SequentialDice(6))
+    dice.roll()
+    dice.roll()
+    assert len(list(cycle_rolls(dice))) == 7
+    assert dice.rounds == 2
+    # 7 rolls of 4 * 6 outcomes each
+    assert cycle_distribution(dice) == {side: 24 for side in range(1, 8)}
+
+
+def test_catalog_d73_is_fair_and_d14_is_not() -> None:
+    catalog = copy.deepcopy(load_catalog())
+    assert verify_dice(catalog[73], 73).is_fair()
+    assert verify_dice(catalog[14], 14).cycle_deviation == Fraction(1, 14)
@@ -0,0 +1,20 @@
+from conftest import enumerated
+from dices.dice import BaseDice, Dice, SequentialDice
+from dices.programming_dices import ForLoopDice, WhileLoopDice
+
+dice_4 = SequentialDice(4)
+dice_6 = SequentialDice(6)
+dice_weird = Dice([0, 0, 5, 5, 10])
+
+
+def test_loops_match_enumeration() -> None:
+    dices: list[BaseDice] = [
+        ForLoopDice(dice_4, dice_6),
+        ForLoopDice(dice_weird, SequentialDice(3)),
+        ForLoopDice(dice_6, Dice([-1, 0, 2])),
+        WhileLoopDice(dice_4, dice_4, 3, loop_limit=3),
+        WhileLoopDice(dice_weird, SequentialDice(3), 1, loop_limit=3),
+        WhileLoopDice(dice_6, dice_4, 7, loop_limit=2),
+    ]
+    for dice in dices:
+        assert dice.get_distribution() == enumerated(dice), dice
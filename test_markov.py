@@ -0,0 +1,40 @@
+import copy
+
+import pytest
+
+from dices.composed_dice import OneExtraSideDice
+from dices.dice import SequentialDice
+from dices.fairness import roll_distribution
+from dices.states_dices import AccumulatorSumDice
+
+
+def test_chain_follows_the_exact_rolls() -> None:
+    dice = OneExtraSideDice(SequentialDice(6))
+    chain = dice.markov_chain()
+    assert len(chain) == 7
+    follower = copy.deepcopy(dice)
+    for roll in range(1, 10):
+        exact = roll_distribution(follower).to_floats()
+        after = chain.distribution_after(roll)
+        assert set(after) == set(exact)
+        for result, probability in exact.items():
+            assert after[result] == pytest.approx(probability)
+    assert dice.rounds == 0
+
+
+def test_stationary_distribution_of_one_extra_side_is_uniform() -> None:
+    chain = OneExtraSideDice(SequentialDice(6)).markov_chain()
+    stationary = chain.stationary_distribution()
+    assert stationary == pytest.approx({side: 1 / 7 for side in range(1, 8)})
+
+
+def test_chains_for_a_number_of_rolls() -> None:
+    dice = AccumulatorSumDice(SequentialDice(2))
+    chain = dice.markov_chain(rolls=3)
+    # the third roll is the sum of three rolls of a d2
+    expected = {3: 1 / 8, 4: 3 / 8, 5: 3 / 8, 6: 1 / 8}
+    assert chain.distribution_after(3) == pytest.approx(expected)
+    with pytest.raises(ValueError):
+        chain.distribution_after(4)
+    with pytest.raises(ValueError):
+        chain.stationary_distribution()
@@ -0,0 +1,90 @@
+import copy
+from collections.abc import Iterator
+from typing import Any
+
+import numpy as np
+
+from dices.catalog import load_catalog
+from dices.composed_dice import MultiDice
+from dices.dice import BaseDice, Dice, SequentialDice
+from dices.math_dices import FloorDivisionDice, HipotenuseDice, SumDice
+from dices.math_operations_dices import NegDice, OffsetDice
+from dices.misc_dices import CarouselDice
+
+
+def reference_matriz(dice: BaseDice) -> Any:
+    """outcomes_matriz as first written, looking up every cell in the outcomes."""
+    outcomes = dice.get_outcomes()
+    unique_values: list[list[int]] = [[] for _ in outcomes[0][0]]
+    for rolls, _ in outcomes:
+        for axis, roll in enumerate(rolls):
+            if roll not in unique_values[axis]:
+                unique_values[axis].append(roll)
+
+    def build(level: int, current_rolls: list[int]) -> Any:
+        if level == len(unique_values):
+            for rolls, result in outcomes:
+                if rolls == current_rolls:
+                    return result
+            return 0
+        return [
+            build(level + 1, current_rolls + [value]) for value in unique_values[level]
+        ]
+
+    return build(0, [])
+
+
+def test_outcomes_matriz_matches_the_cell_by_cell_lookup() -> None:
+    dices: list[BaseDice] = [
+        SequentialDice(6),
+        Dice([0, 0, 5, 5, 10]),
+        SumDice([SequentialDice(4), Dice([3, 1, 3])]),
+        HipotenuseDice(SequentialDice(3), SumDice([SequentialDice(2), Dice([7, 5])])),
+    ]
+    for dice in dices:
+        assert dice.outcomes_matriz() == reference_matriz(dice), dice
+
+
+def test_outcomes_array_axes_hold_the_roll_values() -> None:
+    matriz, axes = SumDice([Dice([3, 1]), SequentialDice(2)]).outcomes_array()
+    assert [axis.tolist() for axis in axes] == [[3, 1], [1, 2]]
+    assert matriz.tolist() == [[4, 5], [2, 3]]
+
+
+def assert_cells_hold_the_outcomes(dice: BaseDice) -> None:
+    # a copy walks the outcomes, since dices with state move on as they do
+    walked = copy.deepcopy(dice)
+    matriz, axes = dice.outcomes_array()
+    positions = [{value: index for index, value in enumerate(axis)} for axis in axes]
+    seen = set()
+    for rolls, result in walked.iter_outcomes():
+        cell = tuple(positions[axis][roll] for axis, roll in enumerate(rolls))
+        if cell not in seen:
+            seen.add(cell)
+            assert matriz[cell] == result, (dice, rolls)
+
+
+def test_outcomes_array_matches_the_outcomes() -> None:
+    dices: list[BaseDice] = [
+        MultiDice([SequentialDice(3), Dice([0, 0, 5, 5, 10]), SequentialDice(2)]),
+        FloorDivisionDice(SumDice([SequentialDice(4), Dice([3, 1, 3])]), Dice([2, 1])),
+        NegDice(OffsetDice(HipotenuseDice(SequentialDice(3), SequentialDice(5)), 2)),
+        CarouselDice([SequentialDice(3), Dice([1, 9])]),
+    ]
+    for dice in dices + copy.deepcopy(load_catalog())[:40]:
+        assert_cells_hold_the_outcomes(dice)
+
+
+def test_outcomes_array_of_d20s_is_built_without_the_outcomes() -> None:
+    dice = MultiDice([SequentialDice(20)] * 4)
+
+    def no_walking() -> Iterator[Any]:
+        raise AssertionError("walked the outcomes")
+
+    dice.iter_outcomes = no_walking  # type: ignore[method-assign]
+    matriz, axes = dice.outcomes_array()
+    assert matriz.shape == (20, 20, 20, 20)
+    assert [axis.tolist() for axis in axes] == [list(range(1, 21))] * 4
+    # the rolls 2, 3, 4 and 5, as digits of the mixed radix
+    assert matriz[1, 2, 3, 4] == 1 + 2 * 20 + 3 * 400 + 4 * 8000 + 1
+    assert np.array_equal(np.sort(matriz.ravel()), np.arange(1, 20**4 + 1))
@@ -0,0 +1,30 @@
+from itertools import islice, product
+
+from dices.dice import SequentialDice
+from dices.math_dices import HipotenuseDice, SumDice
+from dices.math_operations_dices import OffsetDice
+
+dice_4 = SequentialDice(4)
+dice_6 = SequentialDice(6)
+dice_20 = SequentialDice(20)
+
+
+def test_iter_outcomes_walks_every_combination_in_order() -> None:
+    dice = SumDice([dice_4, OffsetDice(dice_6, 2)])
+    expected = [([a, b], a + b + 2) for a, b in product(range(1, 5), range(1, 7))]
+    assert list(dice.iter_outcomes()) == expected
+    assert dice.get_outcomes() == expected
+
+
+def test_bi_dice_outcomes_join_the_rolls_of_both_dices() -> None:
+    dice = HipotenuseDice(SumDice([dice_4, dice_4]), dice_6)
+    outcomes = list(dice.iter_outcomes())
+    assert len(outcomes) == 4 * 4 * 6
+    assert outcomes[0] == ([1, 1, 1], HipotenuseDice(dice_4, dice_4).apply_logic(2, 1))
+
+
+def test_iter_outcomes_is_lazy() -> None:
+    # 20**12 outcomes, only the first few are ever built
+    dice = SumDice([dice_20] * 12)
+    first = list(islice(dice.iter_outcomes(), 3))
+    assert first == [([1] * 12, 12), ([1] * 11 + [2], 13), ([1] * 11 + [3], 14)]
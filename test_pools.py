@@ -0,0 +1,70 @@
+from conftest import enumerated
+from dices.dice import BaseDice, Dice, DiceOfDices, SequentialDice
+from dices.gaming_dices import (
+    AdvantageDices,
+    DisadvantageDices,
+    DropHighestDices,
+    DropLowestDices,
+    KeepHighestDices,
+    KeepLowestDices,
+)
+from dices.statistical_dices import MedianDice, RangeDice, StdDevDice, VarianceDice
+
+dice_4 = SequentialDice(4)
+dice_6 = SequentialDice(6)
+dice_20 = SequentialDice(20)
+
+
+def test_advantage_and_disadvantage_match_enumeration() -> None:
+    disadvantage_6 = DisadvantageDices([dice_6, dice_6])
+    dices: list[BaseDice] = [
+        AdvantageDices([dice_20, dice_20, dice_20]),
+        DisadvantageDices([dice_20, dice_20, dice_20]),
+        AdvantageDices([dice_4, Dice([0, 3, 3, 9]), dice_6]),
+        DisadvantageDices([Dice([-2, 5]), dice_4]),
+        AdvantageDices([dice_6, disadvantage_6]),
+        AdvantageDices([disadvantage_6, disadvantage_6]),
+    ]
+    for dice in dices:
+        assert dice.get_distribution() == enumerated(dice), dice
+
+
+def test_advantage_of_two_d20() -> None:
+    counts = AdvantageDices([dice_20, dice_20]).get_distribution()
+    assert counts == {side: 2 * side - 1 for side in range(1, 21)}
+
+
+def test_order_statistics_match_enumeration() -> None:
+    dices: list[BaseDice] = [
+        MedianDice([dice_6, SequentialDice(8), SequentialDice(10)]),
+        MedianDice([dice_4, dice_6, Dice([1, 1, 7]), dice_4]),
+        RangeDice([dice_6, SequentialDice(8), SequentialDice(10)]),
+        RangeDice([dice_20] * 3),
+        KeepHighestDices([dice_4, dice_6, Dice([2, 2, 9])], 2),
+        KeepLowestDices([dice_6] * 4, 3),
+        KeepLowestDices([dice_6, dice_4, dice_6, dice_4], 1),
+        DropHighestDices([dice_6] * 3),
+    ]
+    for dice in dices:
+        assert dice.get_distribution() == enumerated(dice), dice
+
+
+def test_four_d6_drop_lowest() -> None:
+    counts = DropLowestDices([dice_6] * 4).get_distribution()
+    assert counts.total() == 6**4
+    assert counts[18] == 21
+    assert counts[3] == 1
+    assert counts == enumerated(DropLowestDices([dice_6] * 4))
+
+
+def test_order_free_folds_keep_the_rolls_sorted() -> None:
+    dices: list[DiceOfDices] = [
+        VarianceDice([dice_4, Dice([0, 5, 5]), dice_6]),
+        StdDevDice([dice_6, dice_6, Dice([-3, 9])]),
+    ]
+    for dice in dices:
+        assert dice.fold_roll(dice.fold_roll((), 0, 5), 1, 2) == (2, 5)
+        assert dice.fold_roll((2, 5), 2, 3) == (2, 3, 5)
+        assert dice.get_distribution() == enumerated(dice), dice
+    high = KeepHighestDices([dice_6] * 4, 1)
+    assert high.fold_roll((0, (4,)), 1, 6) == (0, (6,))
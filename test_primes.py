@@ -0,0 +1,29 @@
+import numpy as np
+from sympy import prime  # type: ignore
+
+from dices import primes
+from dices.dice import SequentialDice
+from dices.math_dices import SumDice
+from dices.math_operations_dices import PrimeDice
+
+
+def test_the_table_agrees_with_sympy() -> None:
+    indexes = list(range(1, 200)) + [1_000, 10_007, 123_456]
+    assert [primes.nth_prime(index) for index in indexes] == [
+        prime(index) for index in indexes
+    ]
+    assert primes.nth_primes(np.array(indexes)).tolist() == [
+        prime(index) for index in indexes
+    ]
+    assert primes.nth_prime(primes.MAX_TABLE + 1) == prime(primes.MAX_TABLE + 1)
+
+
+def test_prime_dice_counts_and_rolls_primes() -> None:
+    dice = PrimeDice(SumDice([SequentialDice(6), SequentialDice(6)]))
+    assert dice.max_side == 37  # the 12th prime
+    assert dice.get_distribution() == {
+        int(prime(total)): 6 - abs(total - 7) for total in range(2, 13)
+    }
+    allowed = {int(prime(total)) for total in range(2, 13)}
+    assert {dice.roll() for _ in range(200)} <= allowed
+    assert set(dice.roll_batch(200).tolist()) <= allowed
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from conftest import BatchCountedDice, enumerated
+from dices.composed_dice import DuoDice, MultiDice
+from dices.dice import BaseDice, Dice, SequentialDice
+from dices.rng import DiceRng
+
+dice_4 = SequentialDice(4)
+dice_6 = SequentialDice(6)
+
+
+def test_uniform_radix_counts_match_enumeration() -> None:
+    dices: list[BaseDice] = [
+        MultiDice([dice_4, dice_6]),
+        MultiDice([dice_4, DuoDice(dice_6, Dice([1, 2, 3])), Dice([1, 1, 2, 2])]),
+        DuoDice(MultiDice([dice_4, dice_4]), Dice([2, 1])),
+        # not uniform, so these take the fold
+        MultiDice([Dice([1, 1, 2]), dice_4]),
+        DuoDice(dice_6, Dice([1, 2, 4])),
+    ]
+    for dice in dices:
+        assert dice.get_distribution() == enumerated(dice), dice
+
+
+def test_uniform_batches_skip_the_dices_unless_faithful() -> None:
+    leaves = [BatchCountedDice([1, 2, 3]), BatchCountedDice([2, 1])]
+    dice = MultiDice([leaves[0], DuoDice(leaves[1], dice_4)])
+    dice.set_rng(DiceRng(3))
+    rolls = dice.roll_batch(60_000)
+    assert [leaf.batches for leaf in leaves] == [0, 0]
+    assert sorted(set(rolls.tolist())) == list(range(1, 25))
+    assert abs(np.bincount(rolls)[1:].min() / 60_000 - 1 / 24) < 0.005
+
+    dice.set_faithful_rolls(True)
+    dice.roll_batch(100)
+    # the nested DuoDice is faithful too, so every leaf rolls
+    assert [leaf.batches for leaf in leaves] == [1, 1]
+    dice.set_faithful_rolls(False)
+    dice.roll_batch(100)
+    assert [leaf.batches for leaf in leaves] == [1, 1]
+
+
+def test_one_switch_makes_every_dice_faithful(monkeypatch: pytest.MonkeyPatch) -> None:
+    leaves = [BatchCountedDice([1, 2]), BatchCountedDice([1, 2, 3])]
+    dices: list[BaseDice] = [
+        MultiDice([leaves[0], dice_4]),
+        DuoDice(dice_6, MultiDice([dice_4, leaves[1]])),
+    ]
+    monkeypatch.setattr(BaseDice, "faithful_rolls", True)
+    for dice in dices:
+        dice.roll_batch(100)
+    assert [leaf.batches for leaf in leaves] == [1, 1]
+
+
+def test_non_uniform_batches_roll_every_dice() -> None:
+    leaf = BatchCountedDice([1, 1, 2])
+    dice = DuoDice(leaf, dice_4)
+    dice.set_rng(DiceRng(5))
+    rolls = dice.roll_batch(1000).tolist()
+    assert leaf.batches == 1
+    assert set(rolls) <= set(dice.get_distribution())
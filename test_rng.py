@@ -0,0 +1,53 @@
+import copy
+
+from dices.composed_dice import OneExtraSideDice
+from dices.dice import BaseDice, Dice, SequentialDice, seed_rng
+from dices.math_dices import SumDice
+from dices.rng import DiceRng
+
+
+def rolls(dice: BaseDice, seed: int) -> tuple[list[int], list[int]]:
+    dice.set_rng(DiceRng(seed))
+    single = [dice.roll() for _ in range(50)]
+    batch = dice.roll_batch(50).tolist()
+    return single, batch
+
+
+def test_the_same_seed_replays_the_same_rolls() -> None:
+    dice = SumDice([SequentialDice(20), Dice([1, 10, 100])])
+    assert rolls(dice, 7) == rolls(dice, 7)
+    assert rolls(dice, 7) != rolls(dice, 8)
+
+
+def test_dices_with_state_replay_from_a_copy() -> None:
+    dice = OneExtraSideDice(SequentialDice(6))
+    dice.set_rng(DiceRng(11))
+    replay = copy.deepcopy(dice)
+    assert [dice.roll() for _ in range(30)] == [replay.roll() for _ in range(30)]
+
+
+def test_set_rng_reaches_every_dice_of_the_tree() -> None:
+    inner = SequentialDice(6)
+    dice = SumDice([inner, SumDice([inner, Dice([2, 3])])])
+    rng = DiceRng(3)
+    dice.set_rng(rng)
+    assert inner.rng is rng and inner.dice.rng is rng
+    dice.set_rng(None)
+    assert inner.rng is None
+
+
+def test_seed_rng_replays_the_global_generators() -> None:
+    dice = SumDice([SequentialDice(20), SequentialDice(20)])
+    seed_rng(21)
+    first = ([dice.roll() for _ in range(20)], dice.roll_batch(20).tolist())
+    seed_rng(21)
+    second = ([dice.roll() for _ in range(20)], dice.roll_batch(20).tolist())
+    assert first == second
+
+
+def test_spawned_streams_are_independent_and_repeatable() -> None:
+    children = DiceRng(1).spawn(2)
+    again = DiceRng(1).spawn(2)
+    draws = [child.generator.integers(0, 2**32, 4).tolist() for child in children]
+    assert draws == [child.generator.integers(0, 2**32, 4).tolist() for child in again]
+    assert draws[0] != draws[1]
@@ -0,0 +1,49 @@
+import copy
+
+from conftest import CountedDice, enumerated
+from dices.composed_dice import ComposedDice
+from dices.dice import BaseDice, Dice, SequentialDice
+from dices.math_dices import MultiplicationDice, SumDice
+from dices.programming_dices import RoutingDice
+from dices.states_dices import RemoveItemDice
+
+dice_4 = SequentialDice(4)
+dice_6 = SequentialDice(6)
+dice_weird = Dice([0, 0, 5, 5, 10])
+
+
+def test_routing_matches_enumeration_and_rolls_the_picked_dice() -> None:
+    branches: list[BaseDice] = [dice_4, dice_weird, SumDice([dice_4, dice_4])]
+    dice = RoutingDice(SequentialDice(3), branches)
+    assert dice.get_distribution() == enumerated(dice)
+    product: BaseDice = MultiplicationDice([dice_4] * 2)
+    products: list[BaseDice] = [dice_4, product, product, product]
+    exploding = RoutingDice(dice_4, products)
+    assert exploding.get_distribution() == enumerated(exploding)
+    low, high = CountedDice([1, 2]), CountedDice([3, 4])
+    picky = RoutingDice(SequentialDice(2), [low, high])
+    for _ in range(20):
+        picky.roll()
+    # one of the two dices per roll, never both
+    assert low.rolls + high.rolls == 20
+
+
+def test_composed_dice_counts_like_enumerating_it() -> None:
+    dice = ComposedDice(SequentialDice(3), [dice_6, SequentialDice(8), dice_4])
+    enumerating = copy.deepcopy(dice)
+    for _ in range(3):
+        # the rounds move on with every outcome, in both
+        assert dice.get_distribution() == BaseDice.compute_distribution(enumerating)
+        assert dice.rounds == enumerating.rounds
+
+
+def test_routed_dices_with_state_given_later_roll_every_time() -> None:
+    routing = RoutingDice(SequentialDice(2), [CountedDice([1]), CountedDice([2])])
+    composed = ComposedDice(SequentialDice(2), [CountedDice([1]), CountedDice([2])])
+    for dice in (routing, composed):
+        dice.roll()
+        removers = [RemoveItemDice([1] * 5), RemoveItemDice([2] * 5)]
+        dice.dices[1:] = removers
+        for _ in range(3):
+            dice.roll()
+        assert [len(remover.sides) for remover in removers] == [2, 2], dice
@@ -0,0 +1,27 @@
+import pytest
+
+from dices.cache import distribution_cache
+from dices.dice import Dice, SequentialDice
+from dices.distribution import Distribution
+from dices.math_dices import MultiplicationDice, SumDice
+
+
+def test_a_shared_dice_is_evaluated_once_per_call(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    distribution_cache.clear()
+    inner = SumDice([SequentialDice(6), Dice([1, 7])])
+    calls = []
+    compute = SumDice.compute_distribution
+
+    def counted(dice: SumDice) -> Distribution:
+        calls.append(dice)
+        return compute(dice)
+
+    monkeypatch.setattr(SumDice, "compute_distribution", counted)
+    dice = MultiplicationDice([inner, SumDice([inner, inner]), inner])
+    counts = dice.get_distribution()
+    assert calls.count(inner) == 1
+    distribution_cache.clear()
+    monkeypatch.undo()
+    assert counts == dice.get_distribution()
@@ -0,0 +1,30 @@
+from dices.composed_dice import OneExtraSideDice
+from dices.dice import Dice, SequentialDice
+from dices.math_dices import SumDice
+from dices.parallel import simulate_counts
+
+
+def test_seeded_simulations_repeat() -> None:
+    dice = SumDice([SequentialDice(6), Dice([1, 5, 9])])
+    for vectorized in (True, False):
+        first = dice.simulate_probabilities(5000, vectorized=vectorized, seed=1)
+        second = dice.simulate_probabilities(5000, vectorized=vectorized, seed=1)
+        assert first == second
+        assert first != dice.simulate_probabilities(5000, vectorized=vectorized, seed=2)
+    assert dice.rng is None
+
+
+def test_seeded_simulations_of_dices_with_state_repeat() -> None:
+    first = OneExtraSideDice(SequentialDice(6)).simulate_probabilities(2000, seed=3)
+    second = OneExtraSideDice(SequentialDice(6)).simulate_probabilities(2000, seed=3)
+    assert first == second
+
+
+def test_parallel_counts_do_not_depend_on_the_workers() -> None:
+    dice = SumDice([SequentialDice(6), SequentialDice(8)])
+    one_worker = simulate_counts(dice, 4000, workers=1, seed=5, chunk_size=1000)
+    two_workers = simulate_counts(dice, 4000, workers=2, seed=5, chunk_size=1000)
+    assert one_worker == two_workers
+    assert one_worker.total() == 4000
+    probabilities = dice.simulate_probabilities(4000, workers=2, seed=5)
+    assert probabilities == dice.simulate_probabilities(4000, workers=2, seed=5)
@@ -0,0 +1,46 @@
+from fractions import Fraction
+
+import pytest
+
+from dices.dice import Dice, SequentialDice
+from dices.distribution import Approximation
+from dices.math_dices import ConcatenationDice, ExponentiationDice, SumDice
+
+
+def test_without_approximation_the_distribution_is_exact() -> None:
+    dice = SumDice([SequentialDice(6), SequentialDice(8)])
+    pruned = dice.sparse_distribution()
+    assert pruned == dice.get_distribution()
+    assert pruned.error() == 0
+
+
+def test_dropped_probability_is_accounted_for() -> None:
+    dice = SumDice([SequentialDice(6)] * 5)
+    exact = dice.get_distribution()
+    pruned = dice.sparse_distribution(epsilon=0.01)
+    assert len(pruned) < len(exact)
+    assert pruned.moved == 0
+    # every kept result keeps its exact count, the rest is within missing
+    assert all(count == exact[result] for result, count in pruned.items())
+    assert Fraction(exact.total() - pruned.total(), exact.total()) <= pruned.missing
+
+
+def test_huge_results_are_rounded() -> None:
+    dice = ExponentiationDice(Dice([7, 9]), Dice([40, 41]))
+    pruned = dice.sparse_distribution(digits=3)
+    assert sorted(pruned) == sorted(
+        Approximation(digits=3).round(base**exponent)
+        for base in (7, 9)
+        for exponent in (40, 41)
+    )
+    assert pruned.moved == 1
+    assert len(str(max(pruned)).rstrip("0")) <= 3
+
+
+def test_nested_errors_add_up() -> None:
+    inner = SumDice([SequentialDice(6)] * 3)
+    dice = ConcatenationDice([inner, inner])
+    pruned = dice.sparse_distribution(epsilon=0.02)
+    assert 0 < pruned.missing <= 1
+    with pytest.raises(ValueError):
+        dice.sparse_distribution(epsilon=1.5)
@@ -0,0 +1,93 @@
+from math import sqrt
+from statistics import NormalDist
+
+import numpy as np
+
+from dices.dice import Dice, SequentialDice
+from dices.math_dices import SumDice
+from dices.rng import DiceRng
+from dices.streaming import (
+    add_rolls,
+    check_confidence,
+    known_sides,
+    side_bound,
+    simulate_until,
+    total_variation_bound,
+)
+
+
+def test_add_rolls_counts_dense_and_sparse_batches() -> None:
+    counts: dict[int, int] = {}
+    add_rolls(counts, np.array([1, 2, 2, 3]))
+    add_rolls(counts, np.array([1, 10**6]))
+    add_rolls(counts, np.array([10**30], dtype=object))
+    assert counts == {1: 2, 2: 2, 3: 1, 10**6: 1, 10**30: 1}
+
+
+def test_the_checks_spend_at_most_the_allowed_error() -> None:
+    spent = sum(1 - check_confidence(0.95, check) for check in range(1, 10_000))
+    assert spent <= 0.05
+    assert check_confidence(0.95, 1) > 0.95
+
+
+def wilson_interval(count: int, rolls: int, z: float) -> tuple[float, float]:
+    p = count / rolls
+    centre = (count + z * z / 2) / (rolls + z * z)
+    half_width = z * sqrt(rolls * p * (1 - p) + z * z / 4) / (rolls + z * z)
+    return centre - half_width, centre + half_width
+
+
+def test_side_bound_reaches_both_ends_of_the_wilson_interval() -> None:
+    # few rolls and a rare side: the interval leans far towards 1/2
+    counts = {0: 49, 1: 1}
+    z = NormalDist().inv_cdf(1 - 0.05 / 4)
+    distances = []
+    for count in counts.values():
+        low, high = wilson_interval(count, 50, z)
+        distances.append(max(count / 50 - low, high - count / 50))
+    assert abs(side_bound(counts, 50, 0.95) - max(distances)) < 1e-12
+
+
+def test_bounds_count_the_sides_not_seen_yet() -> None:
+    counts = {1: 40, 2: 60}
+    assert side_bound(counts, 100, 0.95, sides=20) > side_bound(counts, 100, 0.95)
+    assert total_variation_bound(counts, 100, 0.95, sides=20) > (
+        total_variation_bound(counts, 100, 0.95)
+    )
+    # an unseen side is bounded by the top of its interval, from a count of 0
+    z = NormalDist().inv_cdf(1 - 0.05 / 6)
+    assert side_bound({1: 100}, 100, 0.95, sides=3) >= wilson_interval(0, 100, z)[1]
+    assert known_sides(Dice([1, 1, 5, 9])) == 3
+    assert known_sides(SumDice([SequentialDice(6), SequentialDice(6)])) is None
+
+
+def test_simulate_until_reaches_the_precision() -> None:
+    dice = SumDice([SequentialDice(6), SequentialDice(6)])
+    dice.set_rng(DiceRng(4))
+    report = simulate_until(dice, 0.01)
+    assert report.converged
+    assert report.bound <= 0.01
+    assert report.counts.total() == report.rolls_used
+    exact = dice.get_probabilities()
+    for side, probability in report.probabilities.items():
+        assert abs(probability - exact[side]) <= report.bound
+
+
+def test_simulate_until_stops_at_max_rolls() -> None:
+    report = simulate_until(SequentialDice(20), 1e-6, max_rolls=5000)
+    assert not report.converged
+    assert report.rolls_used == 5000
+
+
+def test_stopped_estimates_hold_their_confidence() -> None:
+    # the estimate where the rolls stop must be within the bound at least
+    # 90% of the time, even though the bound is checked after every batch
+    coin = Dice([0, 1])
+    misses = 0
+    runs = 200
+    for seed in range(runs):
+        coin.set_rng(DiceRng(seed))
+        report = simulate_until(coin, 0.05, confidence=0.9, batch_size=100)
+        if abs(report.probabilities.get(1, 0.0) - 0.5) > report.bound:
+            misses += 1
+    assert misses <= runs * 0.1
@@ -0,0 +1,52 @@
+import copy
+from pathlib import Path
+
+from dices.catalog import load_catalog
+from dices.dice import BaseDice, Dice, SequentialDice
+from dices.math_dices import SumDice
+from dices.rng import DiceRng
+from dices.tables import SamplerTables, write_tables
+
+ROLLS = 100_000
+
+
+def frequencies(rolls: list[int]) -> dict[int, float]:
+    counts: dict[int, float] = {}
+    for roll in rolls:
+        counts[roll] = counts.get(roll, 0) + 1 / len(rolls)
+    return counts
+
+
+def test_tables_hold_the_exact_distribution(tmp_path: Path) -> None:
+    dices: list[BaseDice] = [
+        SequentialDice(6),
+        SumDice([SequentialDice(6), Dice([1, 1, 4])]),
+    ]
+    path = str(tmp_path / "dices.tables")
+    write_tables(dices, path)
+    tables = SamplerTables(path)
+    assert len(tables) == 2
+    for number, dice in enumerate(dices):
+        assert tables.get_distribution(number) == dice.get_distribution()
+
+
+def test_tables_roll_like_the_catalog_dices(tmp_path: Path) -> None:
+    # d14 and d73 change with every roll, so the table has to follow roll()
+    # over many rolls, not one enumeration of their outcomes
+    catalog = copy.deepcopy(load_catalog())
+    path = str(tmp_path / "catalog.tables")
+    # d73 goes in at number 20, after the first twenty catalog dices
+    write_tables(catalog[:20] + [catalog[73]], path)
+    tables = SamplerTables(path)
+    fresh = copy.deepcopy(load_catalog())
+    for sides, number in ((14, 14), (73, 20)):
+        dice = fresh[sides]
+        dice.set_rng(DiceRng(sides))
+        rolled = frequencies([dice.roll() for _ in range(ROLLS)])
+        table = frequencies(tables.roll_batch(number, ROLLS, DiceRng(sides)).tolist())
+        assert set(table) <= set(rolled)
+        for side, frequency in rolled.items():
+            # five standard deviations of the gap between two estimates
+            tolerance = 5 * (2 * frequency * (1 - frequency) / ROLLS) ** 0.5
+            assert abs(table.get(side, 0.0) - frequency) <= tolerance, (sides, side)
+    assert tables.get_distribution(20) == {side: 288 for side in range(1, 74)}
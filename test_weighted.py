@@ -0,0 +1,52 @@
+from fractions import Fraction
+
+import pytest
+
+from dices.dice import SequentialDice, WeightedDice
+from dices.math_dices import SumDice
+from dices.rng import DiceRng
+from dices.tables import alias_table
+
+
+def alias_probabilities(weights: list[int]) -> list[Fraction]:
+    """Exact probability of each side when drawing from the alias table of weights."""
+    total = sum(weights)
+    thresholds, aliases = alias_table(weights)
+    probabilities = [Fraction(0)] * len(weights)
+    for side, (threshold, alias) in enumerate(zip(thresholds, aliases)):
+        probabilities[side] += Fraction(threshold, total * len(weights))
+        probabilities[alias] += Fraction(total - threshold, total * len(weights))
+    return probabilities
+
+
+def test_alias_tables_are_exact() -> None:
+    for weights in ([1], [1, 1], [1, 2, 3, 4], [97, 1, 1, 1], [5, 0, 3], [2**70, 3]):
+        total = sum(weights)
+        expected = [Fraction(weight, total) for weight in weights]
+        assert alias_probabilities(weights) == expected
+
+
+def test_weighted_dice_rolls_follow_the_weights() -> None:
+    dice = WeightedDice({1: 1, 2: 2, 10: 7})
+    assert dice.get_distribution() == {1: 1, 2: 2, 10: 7}
+    dice.set_rng(DiceRng(2))
+    rolls = dice.roll_batch(100_000).tolist()
+    single = [dice.roll() for _ in range(100_000)]
+    for side, weight in dice.weights.items():
+        assert abs(rolls.count(side) / 100_000 - weight / 10) < 0.01
+        assert abs(single.count(side) / 100_000 - weight / 10) < 0.01
+
+
+def test_weights_past_int64_still_roll() -> None:
+    dice = WeightedDice({1: 2**64, 2: 2**64 + 2})
+    assert set(dice.roll_batch(20).tolist()) <= {1, 2}
+
+
+def test_to_weighted_keeps_the_distribution() -> None:
+    dice = SumDice([SequentialDice(6), SequentialDice(6)])
+    assert dice.to_weighted().get_distribution() == dice.get_distribution()
+
+
+def test_weights_must_be_positive() -> None:
+    with pytest.raises(ValueError):
+        WeightedDice({1: 0, 2: 1})